@@ -0,0 +1,1034 @@
+import bisect
+from typing import Optional
+
+import numpy as np
+from pulp import LpAffineExpression, LpMaximize, LpProblem, LpVariable, lpSum
+
+# Slack allowed on the budget and credit rows, in line with MILP solvers
+FEASIBILITY_TOLERANCE = 1e-7
+# Objective values and schedule costs this close count as tied
+VALUE_TOLERANCE = 1e-6
+COST_TOLERANCE = 1e-6
+
+
+class CourseMatchModel:
+    """The price-independent part of a CourseMatch problem.
+
+    Variables are the candidate positions ``0..n-1``. Only the budget row
+    depends on prices; every other coefficient is fixed once the candidates
+    are known, which is what lets backends keep a model alive across draws.
+    """
+
+    def __init__(
+        self,
+        names: list[str],
+        objective: np.ndarray,
+        credits: np.ndarray,
+        budget: float,
+        max_credits: float,
+        packing: dict[str, list[int]],
+    ):
+        self.names = names
+        self.objective = np.asarray(objective, dtype=np.float64)
+        self.credits = np.asarray(credits, dtype=np.float64)
+        self.budget = budget
+        self.max_credits = max_credits
+        # Constraint name -> positions of which at most one may be selected
+        self.packing = packing
+        # Position of each candidate when sorted by name, for breaking ties
+        self.rank = np.argsort(np.argsort(np.asarray(names), kind="stable"))
+
+    @property
+    def size(self) -> int:
+        return len(self.names)
+
+
+class SolverBackend:
+    """Solves a loaded ``CourseMatchModel`` for one price vector at a time.
+
+    When several schedules are optimal, every backend returns the same
+    canonical one, so results do not depend on the backend or on options
+    that only make it faster. Among schedules of the highest utility that
+    one is the cheapest under the draw's prices and, among equally cheap
+    ones, the one holding the candidate with the lowest name (uniqueid)
+    where they differ.
+    Candidates without utility are never selected.
+    """
+
+    # Whether solve_all does better than one solve per draw
+    vectorized = False
+
+    def load(self, model: CourseMatchModel):
+        raise NotImplementedError
+
+    def solve(self, prices, incumbent: Optional[list[int]] = None) -> list[int]:
+        """Positions of the selected candidates under ``prices``.
+
+        ``incumbent`` is a schedule known to be feasible under ``prices``
+        (usually the previous draw's optimum) that backends may start from.
+        """
+        raise NotImplementedError
+
+    def solve_all(self, price_matrix) -> list[list[int]]:
+        """Selected positions for every price column of ``price_matrix``."""
+        return [self.solve(price_matrix[:, j]) for j in range(price_matrix.shape[1])]
+
+
+class PulpBackend(SolverBackend):
+    """PuLP model solved with its default (CBC command line) solver."""
+
+    def __init__(self, solver=None):
+        self.solver = solver
+
+    def load(self, model: CourseMatchModel):
+        prob = LpProblem("Course_Scheduler", LpMaximize)
+        self.row_vars = [LpVariable(f"x_{name}", cat="Binary") for name in model.names]
+
+        # Objective function: Maximize the sum of utilities times credits for selected courses
+        prob += (
+            LpAffineExpression(zip(self.row_vars, model.objective.tolist())),
+            "Total_Utility",
+        )
+
+        # 1. Budget constraint; coefficients are filled in per solve
+        prob += (
+            LpAffineExpression((var, 0) for var in self.row_vars) <= model.budget,
+            "Budget_Constraint",
+        )
+
+        # 2. Course unit constraint
+        prob += (
+            LpAffineExpression(zip(self.row_vars, model.credits.tolist()))
+            <= model.max_credits,
+            "Max_Credit_Constraint",
+        )
+
+        # 3. No duplicate course_id and no two courses at the same time
+        for name, members in model.packing.items():
+            prob += (lpSum(self.row_vars[i] for i in members) <= 1, name)
+
+        self.prob = prob
+        # Settles ties between optima the same way as every other backend
+        self.exact = BranchAndBoundBackend()
+        self.exact.load(model)
+        budget = prob.constraints["Budget_Constraint"]
+        # PuLP < 3 constraints are themselves expressions
+        self.budget_row = getattr(budget, "expr", budget)
+
+    def solve(self, prices, incumbent: Optional[list[int]] = None) -> list[int]:
+        for var, price in zip(self.row_vars, np.asarray(prices).tolist()):
+            self.budget_row[var] = price
+        if incumbent is not None:
+            # Only used when the solver was created with warmStart=True
+            chosen = set(incumbent)
+            for i, var in enumerate(self.row_vars):
+                var.setInitialValue(1 if i in chosen else 0)
+        self.prob.solve(self.solver)
+        selected = [i for i, var in enumerate(self.row_vars) if var.varValue == 1]
+        return self.exact.canonical(prices, selected)
+
+
+class ScipyBackend(SolverBackend):
+    """In-process HiGHS through ``scipy.optimize.milp``.
+
+    The constraint matrix is built once; only the data of its dense budget
+    row is overwritten between solves.
+    """
+
+    def load(self, model: CourseMatchModel):
+        from scipy.optimize import Bounds, LinearConstraint
+        from scipy.sparse import csr_array
+
+        n = model.size
+        indptr = [0, n, 2 * n]
+        indices = list(range(n)) * 2
+        data = [0.0] * n + model.credits.tolist()
+        for members in model.packing.values():
+            indices.extend(members)
+            data.extend([1.0] * len(members))
+            indptr.append(len(indices))
+        upper = [model.budget, model.max_credits] + [1] * len(model.packing)
+
+        self.matrix = csr_array(
+            (np.asarray(data), np.asarray(indices), np.asarray(indptr)),
+            shape=(len(upper), n),
+        )
+        self.constraints = LinearConstraint(self.matrix, -np.inf, upper)
+        self.bounds = Bounds(0, 1)
+        self.cost = -model.objective
+        self.integrality = np.ones(n)
+        self.size = n
+        # Settles ties between optima the same way as every other backend
+        self.exact = BranchAndBoundBackend()
+        self.exact.load(model)
+
+    def solve(self, prices, incumbent: Optional[list[int]] = None) -> list[int]:
+        # scipy.optimize.milp has no way to pass a starting solution
+        from scipy.optimize import milp
+
+        self.matrix.data[: self.size] = prices
+        result = milp(
+            self.cost,
+            constraints=self.constraints,
+            integrality=self.integrality,
+            bounds=self.bounds,
+        )
+        if result.x is None:
+            raise RuntimeError(f"MILP solve failed: {result.message}")
+        return self.exact.canonical(prices, np.flatnonzero(result.x > 0.5).tolist())
+
+
+class HighsBackend(SolverBackend):
+    """A persistent in-process HiGHS model through ``highspy``.
+
+    The model is passed to HiGHS once; each solve only changes the budget
+    row coefficients with ``changeCoeff`` and starts from the incumbent, if
+    any, with ``setSolution``.
+    """
+
+    def load(self, model: CourseMatchModel):
+        import highspy
+
+        h = highspy.Highs()
+        h.setOptionValue("output_flag", False)
+        n = model.size
+        inf = highspy.kHighsInf
+        h.addVars(n, np.zeros(n), np.ones(n))
+        h.changeColsIntegrality(
+            n, np.arange(n), np.full(n, highspy.HighsVarType.kInteger)
+        )
+        h.changeColsCost(n, np.arange(n), model.objective)
+        h.changeObjectiveSense(highspy.ObjSense.kMaximize)
+
+        rows = [(np.arange(n), np.zeros(n), model.budget)]
+        rows.append((np.arange(n), model.credits, model.max_credits))
+        for members in model.packing.values():
+            rows.append((np.asarray(members), np.ones(len(members)), 1))
+        for indices, values, upper in rows:
+            h.addRow(-inf, upper, len(indices), indices, values)
+
+        self.highs = h
+        self.size = n
+        self.prices: Optional[np.ndarray] = None
+        # Settles ties between optima the same way as every other backend
+        self.exact = BranchAndBoundBackend()
+        self.exact.load(model)
+
+    def solve(self, prices, incumbent: Optional[list[int]] = None) -> list[int]:
+        import highspy
+
+        prices = np.asarray(prices, dtype=np.float64)
+        for i in range(self.size):
+            if self.prices is None or self.prices[i] != prices[i]:
+                self.highs.changeCoeff(0, i, prices[i])
+        self.prices = prices.copy()
+        if incumbent is not None:
+            # Only a starting point: canonical settles whichever optimum
+            # HiGHS returns
+            start = highspy.HighsSolution()
+            start.col_value = np.isin(np.arange(self.size), incumbent).astype(float)
+            self.highs.setSolution(start)
+        self.highs.run()
+        values = np.asarray(self.highs.getSolution().col_value)
+        return self.exact.canonical(prices, np.flatnonzero(values > 0.5).tolist())
+
+
+def clique_partition(model: CourseMatchModel) -> np.ndarray:
+    """Clique id per candidate; at most one candidate per clique can be chosen.
+
+    Members of a packing row pairwise conflict, so whatever is left of a row
+    after larger rows are taken still forms a clique.
+    """
+    cliques = np.full(model.size, -1)
+    clique = 0
+    for members in sorted(model.packing.values(), key=len, reverse=True):
+        members = np.asarray(members)
+        members = members[cliques[members] < 0]
+        if len(members):
+            cliques[members] = clique
+            clique += 1
+    unassigned = cliques < 0
+    cliques[unassigned] = clique + np.arange(unassigned.sum())
+    return cliques
+
+
+class Candidates:
+    """One draw's candidates in a branch-and-bound search order.
+
+    Only candidates that add utility and fit within ``allowance`` and the
+    credit limit are kept. Conflicts are bitmasks over positions in the
+    order, and ``bounded`` proves that the candidates from a position on
+    cannot add more than a given value.
+    """
+
+    def __init__(self, backend: "BranchAndBoundBackend", prices, allowance, by_name):
+        model = backend.model
+        tol = backend.TOLERANCE
+        self.tol = tol
+        useful = (
+            (model.objective > 0)
+            & (prices <= allowance + tol)
+            & (model.credits <= model.max_credits + tol)
+        )
+        self.budget_weight = 1 / model.budget if model.budget > 0 else 0.0
+        self.credit_weight = 1 / model.max_credits if model.max_credits > 0 else 0.0
+        weights = prices * self.budget_weight + model.credits * self.credit_weight
+        order = np.flatnonzero(useful)
+        if by_name:
+            order = order[np.argsort(model.rank[order], kind="stable")]
+        else:
+            density = np.divide(
+                model.objective,
+                weights,
+                out=np.full(model.size, np.inf),
+                where=weights > 0,
+            )
+            order = order[np.argsort(-density[order], kind="stable")]
+        self.order = order
+
+        # Conflict bitmasks over positions in ``order``
+        position = np.full(model.size, -1)
+        position[order] = np.arange(len(order))
+        self.position = position
+        self.conflicts = [0] * len(order)
+        for members in backend.packing:
+            members = position[members]
+            members = members[members >= 0].tolist()
+            mask = sum(1 << k for k in members)
+            for k in members:
+                self.conflicts[k] |= mask
+
+        self.values = model.objective[order].tolist()
+        self.costs = prices[order].tolist()
+        self.credits = model.credits[order].tolist()
+        self.weights = weights[order].tolist()
+        self.cliques = backend.cliques[order].tolist()
+        self.size = len(order)
+
+        self.quarters = None
+        self.suffix = None
+        if backend.quarters is not None:
+            self.quarters = backend.quarters[order].tolist()
+            capacity = int(np.floor(model.max_credits * 4 + tol))
+            self.suffix = backend.suffix_knapsack(self.values, self.quarters, capacity)
+        # In surrogate density order a fractional knapsack over a whole
+        # suffix is a prefix-sum lookup
+        self.cum_weights = None
+        if not by_name:
+            self.cum_values = np.concatenate([[0.0], np.cumsum(self.values)]).tolist()
+            self.cum_weights = np.concatenate([[0.0], np.cumsum(self.weights)]).tolist()
+
+    def positions(self, chosen: int) -> list[int]:
+        """Candidate positions of a bitmask over the search order."""
+        return sorted(int(self.order[k]) for k in range(self.size) if chosen >> k & 1)
+
+    def mask(self, positions) -> int:
+        return sum(1 << int(self.position[i]) for i in positions)
+
+    def fits(self, k, budget_left, credits_left, blocked) -> bool:
+        return (
+            not blocked >> k & 1
+            and self.costs[k] <= budget_left + self.tol
+            and self.credits[k] <= credits_left + self.tol
+        )
+
+    def bounded(self, k, budget_left, credits_left, blocked, target) -> bool:
+        """Whether candidates ``k..`` provably add no more than ``target``."""
+        quarters_left = int(round(credits_left * 4, 6))
+        if self.suffix is not None and self.suffix[k][quarters_left] <= target:
+            return True
+        surrogate = (
+            max(budget_left, 0) * self.budget_weight + credits_left * self.credit_weight
+        )
+        if self.cum_weights is not None:
+            # Fractional surrogate knapsack over the suffix, conflicts ignored
+            limit = self.cum_weights[k] + surrogate
+            m = bisect.bisect_right(self.cum_weights, limit, k, self.size + 1) - 1
+            bound = self.cum_values[m] - self.cum_values[k]
+            if m < self.size:
+                bound += (
+                    self.values[m] * (limit - self.cum_weights[m]) / self.weights[m]
+                )
+            if bound <= target:
+                return True
+
+        # Each clique relaxed to one item with its best value and lightest
+        # weights, over the candidates that still fit
+        open_ = []
+        relaxed = dict[int, list[float]]()
+        budget_cap = budget_left + self.tol
+        credit_cap = credits_left + self.tol
+        costs, credits = self.costs, self.credits
+        for j in range(k, self.size):
+            if blocked >> j & 1 or costs[j] > budget_cap or credits[j] > credit_cap:
+                continue
+            open_.append(j)
+            item = relaxed.get(self.cliques[j])
+            if item is None:
+                relaxed[self.cliques[j]] = [
+                    self.values[j],
+                    costs[j],
+                    credits[j],
+                    self.weights[j],
+                ]
+            else:
+                item[0] = max(item[0], self.values[j])
+                item[1] = min(item[1], costs[j])
+                item[2] = min(item[2], credits[j])
+                item[3] = min(item[3], self.weights[j])
+
+        items = list(relaxed.values())
+        fractional = BranchAndBoundBackend.fractional
+        if fractional(items, 1, budget_left) <= target:
+            return True
+        if fractional(items, 3, surrogate) <= target:
+            return True
+        if self.quarters is None:
+            return fractional(items, 2, credits_left) <= target
+
+        by_quarters = dict[int, dict[int, float]]()
+        for j in open_:
+            group = by_quarters.setdefault(self.cliques[j], {})
+            size = self.quarters[j]
+            group[size] = max(group.get(size, 0), self.values[j])
+        return (
+            BranchAndBoundBackend.knapsack(by_quarters.values(), quarters_left)
+            <= target
+        )
+
+
+class BranchAndBoundBackend(SolverBackend):
+    """Exact depth-first branch and bound, without an LP library.
+
+    Candidates are ordered by utility density against a surrogate of the two
+    capacity rows (``price / budget + credits / max_credits``) and conflicts
+    are bitmasks over that order. The packing rows are partitioned into
+    cliques once per model. A node is pruned when it is dominated by an
+    earlier node with the same open suffix, or when any of these upper bounds
+    cannot beat the incumbent:
+
+    - a credits-only 0/1 knapsack over the suffix, precomputed per solve
+    - a fractional knapsack over the surrogate row, a prefix-sum lookup in
+      density order
+    - fractional knapsacks over the budget row and the surrogate row, with
+      each clique relaxed to one item with its best value and lightest weights
+    - a credits-only knapsack taking at most one candidate per clique
+
+    Ties are settled by ``canonical``, which the MILP backends share.
+    """
+
+    TOLERANCE = FEASIBILITY_TOLERANCE
+    # Equally cheap optima compared directly; beyond this many, a search in
+    # name order settles the tie
+    TIES = 32
+
+    def load(self, model: CourseMatchModel):
+        self.model = model
+        self.packing = [np.asarray(members) for members in model.packing.values()]
+        self.cliques = clique_partition(model)
+
+        # Credits normally come in quarter units, which makes the credit row
+        # an integer knapsack; anything else falls back to fractional bounds
+        quarters = model.credits * 4
+        self.quarters = None
+        if np.allclose(quarters, np.round(quarters)):
+            self.quarters = np.round(quarters).astype(np.int64)
+
+    @staticmethod
+    def granularity(values) -> float:
+        """Smallest possible improvement over an incumbent, less a tolerance.
+
+        Utilities are usually integers and credits multiples of a quarter, so
+        objective values move in fixed steps and a bound that cannot reach the
+        next step proves the incumbent optimal.
+        """
+        scaled = np.asarray(values) * 4
+        if len(scaled) == 0 or not np.allclose(scaled, np.round(scaled)):
+            return 0.0
+        step = np.gcd.reduce(np.round(scaled).astype(np.int64)) / 4
+        return max(float(step) - 1e-6, 0.0)
+
+    @staticmethod
+    def knapsack(items, capacity: int) -> float:
+        """Best value within ``capacity`` taking at most one item per group.
+
+        ``items`` holds one ``{size: value}`` mapping per group.
+        """
+        table = np.zeros(capacity + 1)
+        for group in items:
+            updated = table.copy()
+            for size, value in group.items():
+                if size <= capacity:
+                    candidate = table[: capacity + 1 - size] + value
+                    np.maximum(updated[size:], candidate, out=updated[size:])
+            table = updated
+        return float(table[capacity])
+
+    @staticmethod
+    def suffix_knapsack(values, quarters, capacity: int) -> list[list[float]]:
+        """``table[k][c]``: best value from candidates ``k..`` within ``c`` quarters."""
+        table = np.zeros((len(values) + 1, capacity + 1))
+        for k in range(len(values) - 1, -1, -1):
+            table[k] = table[k + 1]
+            size = quarters[k]
+            if size <= capacity:
+                candidate = table[k + 1][: capacity + 1 - size] + values[k]
+                np.maximum(table[k][size:], candidate, out=table[k][size:])
+        return table.tolist()
+
+    @staticmethod
+    def fractional(items, axis: int, capacity: float) -> float:
+        capacity = max(capacity, 0)
+        total = 0.0
+        items = sorted(
+            items,
+            key=lambda item: item[0] / item[axis] if item[axis] > 0 else np.inf,
+            reverse=True,
+        )
+        for item in items:
+            if item[axis] <= capacity:
+                total += item[0]
+                capacity -= item[axis]
+            else:
+                return total + item[0] * capacity / item[axis]
+        return total
+
+    def solve(self, prices, incumbent: Optional[list[int]] = None) -> list[int]:
+        return self.canonical(prices, self.optimum(prices, incumbent))
+
+    def optimum(self, prices, incumbent: Optional[list[int]] = None) -> list[int]:
+        """An optimal schedule, whichever of several ties the search meets first."""
+        model = self.model
+        prices = np.asarray(prices, dtype=np.float64)
+        c = Candidates(self, prices, model.budget, by_name=False)
+        values, costs, credits, conflicts = c.values, c.costs, c.credits, c.conflicts
+        slack = self.granularity(values)
+
+        def search(k, value, budget_left, credits_left, chosen, blocked):
+            nonlocal best_value, best_chosen
+            while k < c.size and not c.fits(k, budget_left, credits_left, blocked):
+                k += 1
+            if k == c.size:
+                if value > best_value:
+                    best_value, best_chosen = value, chosen
+                return
+
+            # A node reaching the same open suffix with no more value and no
+            # more budget left than an earlier one cannot lead anywhere better
+            key = (k, blocked >> k, round(credits_left, 6))
+            seen = visited.setdefault(key, [])
+            for seen_value, seen_budget in seen:
+                if seen_value >= value and seen_budget >= budget_left:
+                    return
+            seen.append((value, budget_left))
+
+            # Whatever the subtree adds must reach the next objective step
+            target = best_value + slack - value
+            if c.bounded(k, budget_left, credits_left, blocked, target):
+                return
+            search(
+                k + 1,
+                value + values[k],
+                budget_left - costs[k],
+                credits_left - credits[k],
+                chosen | 1 << k,
+                blocked | conflicts[k],
+            )
+            search(k + 1, value, budget_left, credits_left, chosen, blocked)
+
+        # The empty schedule, or the incumbent; ties are settled afterwards,
+        # so the search only looks for schedules worth more
+        best_value = 0.0
+        best_chosen = 0
+        if incumbent is not None:
+            # Zero-value candidates are not searched and add nothing anyway
+            kept = [i for i in incumbent if c.position[i] >= 0]
+            best_value = float(model.objective[kept].sum())
+            best_chosen = c.mask(kept)
+        visited = dict[tuple, list[tuple[float, float]]]()
+        search(0, 0.0, model.budget, model.max_credits, 0, 0)
+        return c.positions(best_chosen)
+
+    def canonical(self, prices, selected: list[int]) -> list[int]:
+        """The canonical optimum (see SolverBackend), given any optimum ``selected``.
+
+        Knowing the optimal value, a search that prunes by cost finds the
+        cheapest schedules worth that much, and the one holding the lowest
+        names wins. When more than ``TIES`` are equally cheap, a second
+        search tries candidates in name order and stops at the first
+        schedule that cheap instead. Both only explore schedules that can
+        tie on value, so they stay fast however many schedules tie.
+        """
+        prices = np.asarray(prices, dtype=np.float64)
+        selected = [i for i in selected if self.model.objective[i] > 0]
+        if not selected:
+            return []
+        target = self.model.objective[selected].sum() - VALUE_TOLERANCE
+        cost, ties, complete = self.cheapest(prices, target, selected, self.TIES)
+        if not complete:
+            first = self.first_by_name(prices, target, cost + COST_TOLERANCE)
+            if first is not None:
+                return first
+        rank = self.model.rank.tolist()
+        last = self.model.size - 1
+        return max(ties, key=lambda tie: sum(1 << last - rank[i] for i in tie))
+
+    def cheapest(self, prices, target: float, incumbent: list[int], limit: int):
+        """The cheapest schedules worth at least ``target``.
+
+        Returns their cost, the positions of every schedule within
+        COST_TOLERANCE of it, and whether those are all of them: past
+        ``limit`` ties only the first is kept. ``incumbent`` is a schedule
+        worth ``target``. Prices are non-negative, so a schedule stops
+        growing once it is worth ``target``.
+        """
+        best_cost = float(prices[incumbent].sum())
+        c = Candidates(self, prices, best_cost + COST_TOLERANCE, by_name=False)
+        values, costs, credits, conflicts = c.values, c.costs, c.credits, c.conflicts
+        # Schedules found within COST_TOLERANCE of the cheapest, by bitmask
+        ties = {c.mask(incumbent): best_cost}
+        complete = True
+
+        def search(k, value, spent, credits_left, chosen, blocked):
+            nonlocal best_cost, ties, complete
+            if value >= target:
+                if complete:
+                    ties[chosen] = spent
+                    best_cost = min(best_cost, spent)
+                    ties = {
+                        tie: cost
+                        for tie, cost in ties.items()
+                        if cost <= best_cost + COST_TOLERANCE
+                    }
+                    if len(ties) > limit:
+                        complete = False
+                        ties = {min(ties, key=ties.get): best_cost}
+                elif spent < best_cost - COST_TOLERANCE:
+                    best_cost, ties = spent, {chosen: spent}
+                return
+            # Ties are looked for until there are too many to keep, then
+            # only strictly cheaper schedules
+            tolerance = COST_TOLERANCE if complete else -COST_TOLERANCE
+            allowance = best_cost + tolerance - spent
+            while k < c.size and not c.fits(k, allowance, credits_left, blocked):
+                k += 1
+            if k == c.size:
+                return
+
+            # A node reaching the same open suffix with no more value, at a
+            # cost that cannot tie with an earlier one, leads nowhere better
+            key = (k, blocked >> k, round(credits_left, 6))
+            seen = visited.setdefault(key, [])
+            for seen_value, seen_spent in seen:
+                if seen_value >= value and seen_spent < spent - tolerance:
+                    return
+            seen.append((value, spent))
+
+            if c.bounded(k, allowance, credits_left, blocked, target - value - 1e-9):
+                return
+            search(
+                k + 1,
+                value + values[k],
+                spent + costs[k],
+                credits_left - credits[k],
+                chosen | 1 << k,
+                blocked | conflicts[k],
+            )
+            search(k + 1, value, spent, credits_left, chosen, blocked)
+
+        visited = dict[tuple, list[tuple[float, float]]]()
+        search(0, 0.0, 0.0, self.model.max_credits, 0, 0)
+        return best_cost, [c.positions(tie) for tie in ties], complete
+
+    def first_by_name(self, prices, target: float, allowance: float):
+        """Positions of the first schedule in name order worth at least
+        ``target`` and costing at most ``allowance``, or None.
+
+        Candidates are tried in name order, each selected before it is left
+        out, so the first schedule found holds the lowest names.
+        """
+        c = Candidates(self, prices, allowance, by_name=True)
+        values, costs, credits, conflicts = c.values, c.costs, c.credits, c.conflicts
+
+        def search(k, value, spent, credits_left, chosen, blocked):
+            if value >= target:
+                return chosen
+            budget_left = allowance - spent
+            while k < c.size and not c.fits(k, budget_left, credits_left, blocked):
+                k += 1
+            if k == c.size:
+                return None
+
+            # Every node seen so far led nowhere, and neither does one
+            # reaching the same open suffix with no more value for no less
+            key = (k, blocked >> k, round(credits_left, 6))
+            seen = visited.setdefault(key, [])
+            for seen_value, seen_spent in seen:
+                if seen_value >= value and seen_spent <= spent:
+                    return None
+            seen.append((value, spent))
+
+            if c.bounded(k, budget_left, credits_left, blocked, target - value - 1e-9):
+                return None
+            found = search(
+                k + 1,
+                value + values[k],
+                spent + costs[k],
+                credits_left - credits[k],
+                chosen | 1 << k,
+                blocked | conflicts[k],
+            )
+            if found is None:
+                found = search(k + 1, value, spent, credits_left, chosen, blocked)
+            return found
+
+        visited = dict[tuple, list[tuple[float, float]]]()
+        found = search(0, 0.0, 0.0, self.model.max_credits, 0, 0)
+        return None if found is None else c.positions(found)
+
+
+class WarmStartSolver:
+    """Re-solves a loaded backend draw after draw from the previous optimum.
+
+    Only the budget row changes between draws, so the previous optimum is
+    passed on as an incumbent whenever it is still within budget, and a
+    draw with unchanged prices is answered without solving.
+    """
+
+    def __init__(self, backend: SolverBackend, budget: float):
+        self.backend = backend
+        self.budget = budget
+        self.previous: Optional[tuple[np.ndarray, list[int]]] = None
+
+    def solve(self, prices) -> list[int]:
+        prices = np.asarray(prices, dtype=np.float64)
+        incumbent = None
+        if self.previous is not None:
+            previous_prices, previous_selected = self.previous
+            if np.array_equal(prices, previous_prices):
+                return previous_selected
+            if prices[previous_selected].sum() <= self.budget + FEASIBILITY_TOLERANCE:
+                incumbent = previous_selected
+
+        selected = self.backend.solve(prices, incumbent)
+        self.previous = (prices, selected)
+        return selected
+
+
+def enumerate_schedules(
+    model: CourseMatchModel, floor: float, limit: int
+) -> Optional[np.ndarray]:
+    """Every schedule worth at least ``floor``, as boolean rows over candidates.
+
+    Schedules respect the packing and credit rows but not the budget, so the
+    result depends only on the model. Candidates without utility are never
+    included. Returns None when there are more than ``limit`` schedules, or
+    when finding them takes more than ``limit`` search nodes per schedule.
+    """
+    tol = FEASIBILITY_TOLERANCE
+    order = np.flatnonzero(
+        (model.objective > 0) & (model.credits <= model.max_credits + tol)
+    )
+    order = order[np.argsort(-model.objective[order], kind="stable")]
+    position = {int(i): k for k, i in enumerate(order)}
+    conflicts = [0] * len(order)
+    for members in model.packing.values():
+        members = [position[i] for i in members if i in position]
+        mask = sum(1 << k for k in members)
+        for k in members:
+            conflicts[k] |= mask
+
+    values = model.objective[order].tolist()
+    credits = model.credits[order].tolist()
+    cliques = clique_partition(model)[order].tolist()
+
+    # Upper bounds on what candidates k.. can still add: a credits-only
+    # knapsack over the suffix, then one taking at most one open candidate
+    # per clique, as in the branch-and-bound backend
+    quarters = model.credits[order] * 4
+    if np.allclose(quarters, np.round(quarters)):
+        quarters = np.round(quarters).astype(np.int64).tolist()
+        capacity = int(np.floor(model.max_credits * 4 + tol))
+        table = BranchAndBoundBackend.suffix_knapsack(values, quarters, capacity)
+
+        def reachable(k, credits_used, blocked, target):
+            quarters_left = capacity - int(round(credits_used * 4))
+            if table[k][quarters_left] < target or target <= 0:
+                return table[k][quarters_left]
+            groups = dict[int, dict[int, float]]()
+            for j in range(k, len(order)):
+                if not blocked >> j & 1 and quarters[j] <= quarters_left:
+                    group = groups.setdefault(cliques[j], {})
+                    group[quarters[j]] = max(group.get(quarters[j], 0), values[j])
+            return BranchAndBoundBackend.knapsack(groups.values(), quarters_left)
+
+    else:
+        suffix = np.cumsum(values[::-1])[::-1].tolist() + [0.0]
+
+        def reachable(k, credits_used, blocked, target):
+            return suffix[k]
+
+    found = []
+    nodes = 0
+
+    def search(k, value, credits_used, chosen, blocked):
+        nonlocal nodes
+        nodes += 1
+        if nodes > limit * (len(found) + 1):
+            raise OverflowError
+        target = floor - value - 1e-6
+        if reachable(k, credits_used, blocked, target) < target:
+            return
+        if k == len(order):
+            found.append(chosen)
+            if len(found) > limit:
+                raise OverflowError
+            return
+        if (
+            not blocked >> k & 1
+            and credits_used + credits[k] <= model.max_credits + tol
+        ):
+            search(
+                k + 1,
+                value + values[k],
+                credits_used + credits[k],
+                chosen | 1 << k,
+                blocked | conflicts[k],
+            )
+        search(k + 1, value, credits_used, chosen, blocked)
+
+    try:
+        search(0, 0.0, 0.0, 0, 0)
+    except OverflowError:
+        return None
+
+    schedules = np.zeros((len(found), model.size), dtype=bool)
+    for row, chosen in enumerate(found):
+        schedules[row, [order[k] for k in range(len(order)) if chosen >> k & 1]] = True
+    return schedules
+
+
+class ScheduleSet:
+    """Enumerated schedules as 0/1 rows, best value first.
+
+    Rows of (near-)equal value form contiguous blocks, so the best schedule
+    within budget is in the first block whose cheapest row fits. Within a
+    block, rows holding lower-named candidates come first, which makes the
+    first of its cheapest rows the canonical optimum. Blocks are priced a
+    chunk at a time, best first, and a draw stops being priced once its
+    block is found, so the low-value tail of a large enumeration is rarely
+    touched.
+    """
+
+    # Rows priced at a time (whole blocks, so chunks may run over)
+    CHUNK = 2048
+
+    def __init__(self, schedules: np.ndarray, model: CourseMatchModel):
+        values = schedules.astype(np.float64) @ model.objective
+        order = np.argsort(-values, kind="stable")
+        schedules, values = schedules[order], values[order]
+        block = np.cumsum(np.diff(values, prepend=np.inf) < -VALUE_TOLERANCE)
+        # np.lexsort sorts by its last key first: block, then the lowest name
+        by_name = schedules[:, np.argsort(model.rank)]
+        keys = [~by_name[:, j] for j in range(by_name.shape[1] - 1, -1, -1)]
+        order = np.lexsort(keys + [block])
+        self.schedules = schedules[order].astype(np.float64)
+        self.values = values[order]
+
+        starts = np.flatnonzero(np.diff(block, prepend=-1) > 0)
+        self.chunks = []
+        first = 0
+        while first < len(starts):
+            last = np.searchsorted(starts, starts[first] + self.CHUNK, side="left")
+            last = max(last, first + 1)
+            low = starts[first]
+            high = starts[last] if last < len(starts) else len(self.values)
+            self.chunks.append((low, high, starts[first:last] - low))
+            first = last
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def positions(self, row: int) -> list[int]:
+        return np.flatnonzero(self.schedules[row]).tolist()
+
+    def best(self, price_matrix, budget: float) -> np.ndarray:
+        """Row of the canonical best-valued schedule within budget, per draw.
+
+        Draws where no schedule fits get -1.
+        """
+        budget = budget + FEASIBILITY_TOLERANCE
+        rows = np.full(price_matrix.shape[1], -1)
+        pending = np.arange(price_matrix.shape[1])
+        for low, high, starts in self.chunks:
+            if len(pending) == 0:
+                break
+            # (pending draws x rows), so each block is a contiguous slice
+            costs = price_matrix[:, pending].T @ self.schedules[low:high].T
+            cheapest = np.minimum.reduceat(costs, starts, axis=1)
+            fits = cheapest <= budget
+            found = np.flatnonzero(fits.any(axis=1))
+            ends = np.r_[starts[1:], high - low]
+            for i, block in zip(found, fits[found].argmax(axis=1)):
+                start, end = starts[block], ends[block]
+                block_costs = costs[i, start:end]
+                tied = (block_costs <= cheapest[i, block] + COST_TOLERANCE) & (
+                    block_costs <= budget
+                )
+                rows[pending[i]] = low + start + np.argmax(tied)
+            pending = np.delete(pending, found)
+        return rows
+
+
+class EnumerationBackend(SolverBackend):
+    """Answers draws from every schedule of the model, enumerated once.
+
+    Utilities, credits and conflicts do not change between draws, so neither
+    does the set of schedules that respect them. Only schedules built from
+    candidates with utility are kept: with non-negative prices any other
+    schedule costs at least as much as one of these for no more utility. A
+    draw's optimum is then the best schedule within budget, ties broken the
+    canonical way (see SolverBackend), and solve_all prices every schedule
+    under every draw with one matrix product. Models with more than ``limit``
+    schedules are handed to the ``fallback`` backend instead.
+    """
+
+    LIMIT = 50000
+    # Draws priced at a time
+    BLOCK = 2048
+
+    def __init__(self, limit: int = LIMIT, fallback="bnb"):
+        self.limit = limit
+        self.fallback = fallback
+
+    @property
+    def vectorized(self) -> bool:
+        return self.solver is None
+
+    def load(self, model: CourseMatchModel):
+        self.model = model
+        self.solver = None
+        schedules = enumerate_schedules(model, 0.0, self.limit)
+        if schedules is None:
+            self.solver = get_backend(self.fallback)
+            self.solver.load(model)
+            return
+        self.schedules = ScheduleSet(schedules, model)
+
+    def solve(self, prices, incumbent: Optional[list[int]] = None) -> list[int]:
+        if self.solver is not None:
+            return self.solver.solve(prices, incumbent)
+        return self.solve_all(np.asarray(prices, dtype=np.float64)[:, np.newaxis])[0]
+
+    def solve_all(self, price_matrix) -> list[list[int]]:
+        if self.solver is not None:
+            return self.solver.solve_all(price_matrix)
+        price_matrix = np.asarray(price_matrix, dtype=np.float64)
+        selections = []
+        for start in range(0, price_matrix.shape[1], self.BLOCK):
+            rows = self.schedules.best(
+                price_matrix[:, start : start + self.BLOCK], self.model.budget
+            )
+            selections.extend(self.schedules.positions(row) for row in rows)
+        return selections
+
+
+class ScheduleCache:
+    """Answers draws from schedules already found, solving only when needed.
+
+    The objective does not depend on prices, so any cached schedule within
+    budget proves the draw's optimum is worth at least its value ``v``. Every
+    schedule worth ``v`` or more is enumerated once (it depends only on the
+    model), and the draw's optimum is then the best of them within budget,
+    found with one matrix-vector product. The solver only runs when no cached
+    schedule fits, or when too many schedules are worth ``v`` to enumerate.
+
+    ScheduleSet breaks ties the canonical way, so every answer is the one
+    the solver would have returned.
+    """
+
+    LIMIT = 50000
+
+    def __init__(self, solver, model: CourseMatchModel, limit: int = LIMIT):
+        self.solver = solver
+        self.model = model
+        self.limit = limit
+        # Solved schedules as 0/1 float rows over candidates
+        self.cached = np.zeros((0, model.size))
+        # Enumerated schedules worth at least ``floor``
+        self.floor = np.inf
+        self.schedules = ScheduleSet(np.zeros((0, model.size), dtype=bool), model)
+        # Highest floor known to have more than ``limit`` schedules
+        self.overflow = -np.inf
+        self.hits = 0
+        self.solves = 0
+
+    def solve(self, prices) -> list[int]:
+        prices = np.asarray(prices, dtype=np.float64)
+        budget = self.model.budget + FEASIBILITY_TOLERANCE
+
+        # 1. Enumerated schedules already contain the optimum if any of them fit
+        selected = self.best(prices)
+        if selected is not None:
+            self.hits += 1
+            return selected
+
+        # 2. Otherwise the best cached schedule within budget bounds the optimum
+        values = self.cached @ self.model.objective
+        fits = self.cached @ prices <= budget
+        if fits.any() and self.enumerate(values[fits].max()):
+            self.hits += 1
+            return self.best(prices)
+
+        # 3. Solve, and enumerate around the optimum for later draws
+        self.solves += 1
+        solved = self.solver.solve(prices)
+        row = np.zeros(self.model.size)
+        row[solved] = 1.0
+        if not (self.cached == row).all(axis=1).any():
+            self.cached = np.vstack([self.cached, row])
+        self.enumerate(self.model.objective[solved].sum())
+        return solved
+
+    def enumerate(self, floor: float) -> bool:
+        """Make sure every schedule worth ``floor`` or more is enumerated."""
+        # Schedules just short of ``floor`` still tie with it
+        floor -= VALUE_TOLERANCE
+        if floor >= self.floor:
+            return True
+        if floor <= self.overflow:
+            return False
+        schedules = enumerate_schedules(self.model, floor, self.limit)
+        if schedules is None:
+            self.overflow = floor
+            return False
+        self.floor = floor
+        self.schedules = ScheduleSet(schedules, self.model)
+        return True
+
+    def best(self, prices) -> Optional[list[int]]:
+        """The canonical best of the enumerated schedules within budget."""
+        row = self.schedules.best(prices[:, np.newaxis], self.model.budget)[0]
+        if row < 0:
+            return None
+        return self.schedules.positions(row)
+
+
+BACKENDS = {
+    "pulp": PulpBackend,
+    "scipy": ScipyBackend,
+    "highs": HighsBackend,
+    "bnb": BranchAndBoundBackend,
+    "enum": EnumerationBackend,
+}
+
+
+def get_backend(backend) -> SolverBackend:
+    """Resolve a backend name (or pass through a backend instance)."""
+    if isinstance(backend, SolverBackend):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(
+            f"Unknown solver backend {backend!r}; expected one of {sorted(BACKENDS)}"
+        )
+    return BACKENDS[backend]()
@@ -0,0 +1,332 @@
+import glob
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Optional
+
+import pandas as pd
+
+import catalog_artifact
+from catalog_tables import load_tables
+from coursematch_solver import CourseMatchSolver
+from result_cache import fingerprint
+from terms import TermRegistry
+
+# Term, compiled catalog and backend of a pool worker, set up once per process
+_worker = None
+
+
+def _init_worker(term_id: str, backend: str):
+    global _worker
+    registry = TermRegistry(capacity=1)
+    _worker = (registry.term(term_id), registry.catalog(term_id), backend)
+
+
+def _solve(student: str, candidates: dict, seeds: list[int], key: str):
+    term, catalog, backend = _worker
+    schedules = CourseMatchSolver.solve_many(
+        term.catalog_path,
+        candidates,
+        seeds=seeds,
+        catalog=catalog,
+        backend=backend,
+        ztable=term.ztable_path,
+    )
+    return [
+        {"student": student, "seed": seed, "fingerprint": key, "schedule": schedule}
+        for seed, schedule in zip(seeds, schedules)
+    ]
+
+
+def read_students(path) -> dict[str, dict]:
+    """Student inputs by id, from a directory of JSON files or a JSONL file.
+
+    Each input is shaped like ``example_input``. Files are identified by
+    their name without ``.json``; JSONL lines by their ``id`` field, or
+    their line number when they have none.
+    """
+    students = {}
+    if os.path.isdir(path):
+        for name in sorted(glob.glob(os.path.join(path, "*.json"))):
+            with open(name) as file:
+                students[os.path.basename(name)[: -len(".json")]] = json.load(file)
+        return students
+
+    with open(path) as file:
+        for number, line in enumerate(file, 1):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            student = str(record.pop("id", number))
+            if student in students:
+                raise ValueError(f"{path}:{number}: duplicate student id {student!r}")
+            students[student] = record
+    return students
+
+
+def claim(manifest_path, manifest: dict, resuming: bool):
+    """Write the run ``manifest`` of a new output, or check a resumed one's.
+
+    Results only resume into an output written by the same run: the same
+    term, compiled catalog and backend.
+    """
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as file:
+            written = json.load(file)
+        if written != manifest:
+            raise ValueError(
+                f"{manifest_path}: the output was written by another run "
+                f"({written}), not {manifest}; choose another output"
+            )
+        return
+    if resuming:
+        raise ValueError(
+            f"{manifest_path} is missing, so results already in the output "
+            "cannot be matched to this run; choose another output"
+        )
+    os.makedirs(os.path.dirname(manifest_path) or ".", exist_ok=True)
+    with open(manifest_path, "w") as file:
+        json.dump(manifest, file)
+
+
+class JsonlWriter:
+    """Appends one JSON line per (student, seed) and flushes as it goes.
+
+    The run manifest sits next to the file, in ``<path>.manifest.json``.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.manifest_path = f"{path}.manifest.json"
+
+    def done(self) -> dict[tuple[str, int], str]:
+        """Fingerprints of the (student, seed) pairs already written.
+
+        A torn last line is dropped. Later lines win, since a pair is
+        written again when its student's input changes.
+        """
+        if not os.path.exists(self.path):
+            return {}
+        with open(self.path, "rb+") as file:
+            data = file.read()
+            end = data.rfind(b"\n") + 1
+            if end < len(data):
+                file.truncate(end)
+        records = (json.loads(line) for line in data[:end].splitlines())
+        return {
+            (record["student"], record["seed"]): record.get("fingerprint")
+            for record in records
+        }
+
+    def write(self, records: list[dict]):
+        with open(self.path, "a") as file:
+            file.writelines(json.dumps(record) + "\n" for record in records)
+
+    def close(self):
+        pass
+
+
+class ParquetWriter:
+    """Writes a directory of Parquet parts, one every ``rows`` results.
+
+    Parts are written under a temporary name and renamed into place, so a
+    directory only ever holds complete parts. The run manifest is the
+    directory's ``manifest.json``. Needs pyarrow.
+    """
+
+    def __init__(self, path, rows: int = 1000):
+        # Fail before anything is solved rather than at the first part
+        import pyarrow  # noqa: F401
+
+        self.path = path
+        self.manifest_path = os.path.join(path, "manifest.json")
+        self.rows = rows
+        self._buffer = []
+
+    def _parts(self) -> list[str]:
+        return sorted(glob.glob(os.path.join(self.path, "part-*.parquet")))
+
+    def done(self) -> dict[tuple[str, int], str]:
+        parts = self._parts()
+        if not parts:
+            return {}
+        frame = pd.concat(
+            pd.read_parquet(part, columns=["student", "seed", "fingerprint"])
+            for part in parts
+        )
+        return dict(
+            zip(
+                zip(frame["student"], frame["seed"].astype(int)),
+                frame["fingerprint"],
+            )
+        )
+
+    def write(self, records: list[dict]):
+        self._buffer.extend(records)
+        if len(self._buffer) >= self.rows:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+        os.makedirs(self.path, exist_ok=True)
+        target = os.path.join(self.path, f"part-{len(self._parts()):05d}.parquet")
+        pd.DataFrame(self._buffer).to_parquet(target + ".tmp", index=False)
+        os.replace(target + ".tmp", target)
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+
+
+def open_writer(path):
+    """A Parquet writer for ``*.parquet`` paths, JSONL otherwise."""
+    if str(path).rstrip(os.sep).endswith(".parquet"):
+        return ParquetWriter(path)
+    return JsonlWriter(path)
+
+
+def run_batch(
+    students: dict[str, dict],
+    output,
+    term_id: Optional[str] = None,
+    seeds: Optional[list[int]] = None,
+    workers: int = 1,
+    chunk: Optional[int] = None,
+    backend: str = "highs",
+    log=sys.stderr,
+) -> dict:
+    """Forecast every student for every seed, writing results to ``output``.
+
+    Without ``seeds`` each student is solved once, for their own seed.
+    Students x seeds are split into tasks of at most ``chunk`` seeds, each
+    solved from a single setup, and spread across ``workers`` processes
+    that share the term's memory-mapped catalog artifact.
+
+    An interrupted run picks up where it left off. ``output`` carries a run
+    manifest (term, catalog version and backend) and refuses results from
+    any other run. Each record carries its student's input fingerprint, and
+    pairs already written with the current fingerprint are skipped. A
+    student whose input changed is solved again, and the new records
+    supersede the old ones (see ``demand.read_results``).
+    """
+    registry = TermRegistry(capacity=1)
+    term_id = term_id or registry.latest
+    term = registry.term(term_id)
+
+    # Compile the catalog once; workers map the artifact instead
+    catalog = registry.catalog(term_id)
+    tables = load_tables(term_id)
+    artifact = catalog_artifact.artifact_path(term.catalog_path)
+    if not catalog_artifact.is_fresh(artifact, term.catalog_path, tables.version):
+        catalog_artifact.save(catalog, term.catalog_path, tables.version)
+
+    writer = open_writer(output)
+    done = writer.done()
+    claim(
+        writer.manifest_path,
+        {"term": term_id, "catalog": catalog.version, "backend": backend},
+        resuming=bool(done),
+    )
+    tasks = []
+    skipped = 0
+    for student, candidates in students.items():
+        # Seeds are recorded with each result, so they are not part of the key
+        key = fingerprint(
+            {k: v for k, v in candidates.items() if k != "seed"},
+            catalog,
+            backend,
+            ztable=term.ztable_path,
+        )
+        wanted = seeds or [candidates.get("seed", 1)]
+        pending = [seed for seed in wanted if done.get((student, seed)) != key]
+        skipped += len(wanted) - len(pending)
+        size = chunk or len(pending) or 1
+        for start in range(0, len(pending), size):
+            tasks.append((student, candidates, pending[start : start + size], key))
+
+    total = sum(len(task[2]) for task in tasks)
+    print(
+        f"{term_id}: {len(students)} students, {total} solves to go, "
+        f"{skipped} already done",
+        file=log,
+    )
+
+    solved = failed = 0
+    started = last_report = time.perf_counter()
+
+    def record(task, outcome):
+        nonlocal solved, failed, last_report
+        try:
+            records = outcome()
+        except Exception as error:
+            failed += len(task[2])
+            print(f"{task[0]}: {type(error).__name__}: {error}", file=log)
+            return
+        writer.write(records)
+        solved += len(records)
+        now = time.perf_counter()
+        if now - last_report >= 5:
+            last_report = now
+            rate = solved / (now - started)
+            print(f"{solved}/{total} solves ({rate:.1f} solves/sec)", file=log)
+
+    try:
+        if workers > 1:
+            with ProcessPoolExecutor(
+                workers, initializer=_init_worker, initargs=(term_id, backend)
+            ) as pool:
+                futures = {pool.submit(_solve, *task): task for task in tasks}
+                for future in as_completed(futures):
+                    record(futures[future], future.result)
+        else:
+            _init_worker(term_id, backend)
+            for task in tasks:
+                record(task, lambda: _solve(*task))
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - started
+    rate = solved / elapsed if elapsed else 0.0
+    print(
+        f"{solved} solves in {elapsed:.1f}s ({rate:.1f} solves/sec), "
+        f"{failed} failed",
+        file=log,
+    )
+    return {
+        "solved": solved,
+        "failed": failed,
+        "skipped": skipped,
+        "seconds": elapsed,
+        "solves_per_sec": rate,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Forecast schedules for a cohort of students"
+    )
+    parser.add_argument("input", help="Directory of JSON inputs or a JSONL file")
+    parser.add_argument("output", help="JSONL file, or a *.parquet directory")
+    parser.add_argument("--term", help="Term id (default: the latest)")
+    parser.add_argument(
+        "--seeds", type=int, help="Solve seeds 1..N (default: each input's own seed)"
+    )
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--chunk", type=int, help="Seeds per task (default: all)")
+    parser.add_argument("--backend", default="highs")
+    args = parser.parse_args()
+
+    run_batch(
+        read_students(args.input),
+        args.output,
+        term_id=args.term,
+        seeds=list(range(1, args.seeds + 1)) if args.seeds else None,
+        workers=args.workers,
+        chunk=args.chunk,
+        backend=args.backend,
+    )
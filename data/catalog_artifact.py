@@ -0,0 +1,158 @@
+import datetime
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+MANIFEST = "manifest.json"
+
+
+def artifact_path(source) -> str:
+    """Directory holding the compiled artifact of a catalog workbook."""
+    return os.path.splitext(os.path.abspath(source))[0] + ".catalog"
+
+
+def _fingerprint(source) -> dict:
+    stat = os.stat(source)
+    return {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+
+
+def _manifest(directory) -> dict | None:
+    try:
+        with open(os.path.join(directory, MANIFEST)) as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return None
+
+
+def is_fresh(directory, source, tables_version) -> bool:
+    """Whether ``directory`` holds an artifact compiled from ``source`` as it is
+    now, with the lookup tables at ``tables_version``."""
+    manifest = _manifest(directory)
+    return (
+        manifest is not None
+        and manifest.get("version") == FORMAT_VERSION
+        and manifest.get("source") == _fingerprint(source)
+        and manifest.get("tables") == tables_version
+    )
+
+
+def _encode(series: pd.Series):
+    """Split a column into an array for disk and its manifest entry.
+
+    Numeric and datetime columns are saved as they are. Text and mixed
+    columns are dictionary-encoded: int32 codes, with -1 for missing values,
+    and the distinct values kept in the manifest.
+    """
+    entry = {"name": series.name, "dtype": str(series.dtype)}
+    if series.dtype.kind in "biufM":
+        entry["kind"] = "array"
+        return series.to_numpy(), entry
+
+    codes, values = pd.factorize(series)
+    values = values.tolist()
+    if values and all(isinstance(v, datetime.time) for v in values):
+        entry["kind"] = "time"
+        values = [v.isoformat() for v in values]
+    else:
+        entry["kind"] = "dictionary"
+    entry["values"] = values
+    return codes.astype(np.int32), entry
+
+
+def _decode(array: np.ndarray, entry: dict) -> pd.Series:
+    if entry["kind"] == "array":
+        return pd.Series(array, name=entry["name"], copy=False)
+
+    values = entry["values"]
+    if entry["kind"] == "time":
+        values = [datetime.time.fromisoformat(v) for v in values]
+    # The trailing slot is what code -1 picks up
+    lookup = np.empty(len(values) + 1, dtype=object)
+    lookup[:-1] = values
+    lookup[-1] = np.nan
+    return pd.Series(lookup[array], name=entry["name"]).astype(entry["dtype"])
+
+
+def save(compiled, source, tables_version, directory=None) -> str:
+    """Write a compiled catalog as one ``.npy`` file per column plus a manifest.
+
+    The manifest is removed first and written last, so an interrupted build
+    reads as stale rather than as a half-written artifact.
+    """
+    directory = directory or artifact_path(source)
+    os.makedirs(directory, exist_ok=True)
+    manifest_path = os.path.join(directory, MANIFEST)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    columns = []
+    for i, name in enumerate(compiled.frame.columns):
+        array, entry = _encode(compiled.frame[name])
+        entry["file"] = f"column_{i}.npy"
+        np.save(os.path.join(directory, entry["file"]), array)
+        columns.append(entry)
+    np.save(os.path.join(directory, "slot_bits.npy"), compiled.slot_bits)
+    np.save(os.path.join(directory, "group_codes.npy"), compiled.group_codes)
+
+    manifest = {
+        "version": FORMAT_VERSION,
+        "source": _fingerprint(source),
+        "tables": tables_version,
+        "columns": columns,
+        "slot_labels": list(compiled.slot_labels),
+        "group_labels": compiled.group_labels.tolist(),
+    }
+    staging = manifest_path + ".tmp"
+    with open(staging, "w") as file:
+        json.dump(manifest, file, default=lambda value: value.item())
+    os.replace(staging, manifest_path)
+    return directory
+
+
+def load(directory) -> dict:
+    """Memory-map an artifact written by :func:`save`.
+
+    Returns the keyword arguments of ``CompiledCatalog``. Numeric columns and
+    the slot and group arrays stay read-only views of the files on disk; only
+    dictionary-encoded columns are materialized.
+    """
+    manifest = _manifest(directory)
+    if manifest is None:
+        raise FileNotFoundError(f"No compiled catalog in {directory}")
+
+    def mapped(file):
+        return np.load(os.path.join(directory, file), mmap_mode="r")
+
+    frame = pd.DataFrame(
+        {
+            entry["name"]: _decode(mapped(entry["file"]), entry)
+            for entry in manifest["columns"]
+        },
+        copy=False,
+    )
+    return {
+        "frame": frame,
+        "slot_labels": manifest["slot_labels"],
+        "slot_bits": mapped("slot_bits.npy"),
+        "group_codes": mapped("group_codes.npy"),
+        "group_labels": pd.Index(manifest["group_labels"]),
+    }
+
+
+if __name__ == "__main__":
+    import sys
+
+    from catalog_tables import load_tables
+    from coursematch_solver import CatalogStore, CompiledCatalog
+    from terms import discover
+
+    # Every discovered term unless term ids are named
+    terms = discover()
+    for term_id in sys.argv[1:] or list(terms):
+        source, tables = terms[term_id].catalog_path, load_tables(term_id)
+        compiled = CompiledCatalog.from_frame(CatalogStore.get(source), tables)
+        target = save(compiled, source, tables.version)
+        print(f"{term_id}: {source} -> {target}")
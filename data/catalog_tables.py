@@ -0,0 +1,108 @@
+import functools
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+TABLES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tables")
+
+
+class CatalogTables:
+    """Lookup tables that turn catalog columns into course groups and time slots.
+
+    - ``cross_listings.csv``: course -> group of courses that count as one
+    - ``parts_of_term.csv``: part_of_term -> quarter, one row per quarter,
+      plus the label the app shows for it
+    - ``days.csv``: days_code -> day, one row per day
+    - ``time_slots.csv``: start time -> slot. A section occupies the slot it
+      starts in and every later slot that starts before it ends.
+
+    A term can override any of these with a file of the same name in
+    ``tables/<term_id>/``. ``version`` hashes the files in use, so compiled
+    catalogs can tell when the tables they were built with have changed.
+    """
+
+    NAMES = ("cross_listings", "parts_of_term", "days", "time_slots")
+
+    def __init__(self, directory=TABLES_DIR, term_id=None):
+        digest = hashlib.sha256()
+        frames = {}
+        for name in self.NAMES:
+            path = os.path.join(directory, f"{name}.csv")
+            if term_id is not None:
+                override = os.path.join(directory, term_id, f"{name}.csv")
+                path = override if os.path.exists(override) else path
+            with open(path, "rb") as file:
+                digest.update(file.read())
+            frames[name] = pd.read_csv(path, dtype=str, keep_default_na=False)
+        self.version = digest.hexdigest()[:16]
+
+        self.cross_listings = frames["cross_listings"].set_index("course")["group"]
+        parts = frames["parts_of_term"]
+        self.parts_of_term = parts[["part_of_term", "quarter"]]
+        labels = parts.drop_duplicates("part_of_term").set_index("part_of_term")
+        self.quarter_labels = labels["label"].replace("", np.nan)
+        self.days = frames["days"]
+        slots = frames["time_slots"]
+        self.slot_starts = _seconds(slots["start"] + ":00")
+        self.slot_codes = slots["slot"].to_numpy()
+
+    def course_ids(self, primary_section_ids: pd.Series) -> pd.Series:
+        """Course of each section, with cross-listed courses mapped to their group."""
+        courses = primary_section_ids.str[:8]
+        return courses.map(self.cross_listings).fillna(courses)
+
+    def class_times(self, df: pd.DataFrame) -> pd.DataFrame:
+        """One (row, label) pair per ``ct_<quarter><day><slot>`` a row of ``df`` occupies.
+
+        Rows are positions in ``df``. Parts of term, day codes or start times
+        missing from the tables raise ValueError.
+        """
+        rows = pd.DataFrame(
+            {
+                "row": np.arange(len(df)),
+                "part_of_term": df["part_of_term"].astype(str).to_numpy(),
+                "days_code": df["days_code"].to_numpy(),
+            }
+        )
+        quarters = rows.merge(self.parts_of_term, on="part_of_term")
+        days = rows.merge(self.days, on="days_code")
+        self._check(rows, quarters, "part_of_term")
+        self._check(rows, days, "days_code")
+
+        # Row x slot: the slot the row starts in, and later ones it runs into
+        start = _seconds(df["start_time_24hr"].astype(str))[:, np.newaxis]
+        stop = _seconds(df["stop_time_24hr"].astype(str))[:, np.newaxis]
+        starts_in = start == self.slot_starts
+        runs_into = (start < self.slot_starts) & (self.slot_starts < stop)
+        unknown = ~starts_in.any(axis=1)
+        if unknown.any():
+            times = df["start_time_24hr"].to_numpy()[unknown]
+            raise ValueError(
+                f"Start times {sorted(set(map(str, times)))} match no slot"
+            )
+        row, slot = np.nonzero(starts_in | runs_into)
+        slots = pd.DataFrame({"row": row, "slot": self.slot_codes[slot]})
+
+        times = quarters[["row", "quarter"]].merge(days[["row", "day"]], on="row")
+        times = times.merge(slots, on="row")
+        label = "ct_" + times["quarter"] + times["day"] + times["slot"]
+        return pd.DataFrame({"row": times["row"], "label": label})
+
+    @staticmethod
+    def _check(rows, matched, column):
+        unknown = set(rows[column]) - set(matched[column])
+        if unknown:
+            raise ValueError(f"No table entry for {column} {sorted(unknown)}")
+
+
+def _seconds(times: pd.Series) -> np.ndarray:
+    """Seconds since midnight of "HH:MM:SS" strings."""
+    return pd.to_timedelta(times).dt.total_seconds().to_numpy()
+
+
+@functools.lru_cache(maxsize=None)
+def load_tables(term_id=None, directory=TABLES_DIR) -> CatalogTables:
+    """The tables for a term (or the defaults), read once per process."""
+    return CatalogTables(directory, term_id)
@@ -1,8 +1,18 @@
-import datetime
-from typing import Hashable, Optional
+import functools
+import hashlib
+import os
+import threading
+from typing import Optional
 
+import numpy as np
 import pandas as pd
-from pulp import LpMaximize, LpProblem, LpVariable, lpSum
+from scipy.special import ndtri
+
+import catalog_artifact
+from catalog_tables import CatalogTables, load_tables
+import web_catalog
+from backends import CourseMatchModel, SolverBackend, WarmStartSolver, get_backend
+from sampling import sample_normals
 
 example_input = {
     "budget": 5000,
@@ -46,23 +56,183 @@ example_output = [
 ]
 
 
+def read_catalog(path) -> pd.DataFrame:
+    """Parse a catalog workbook, or a web export into the workbook's columns."""
+    if web_catalog.is_export(path):
+        return web_catalog.read_catalog(path)
+    return pd.read_excel(path)
+
+
+def _load_cached(cache: dict, lock: threading.Lock, path, loader):
+    """Return ``loader(path)``, reusing the cached value while the file is unchanged."""
+    key = os.path.abspath(path)
+    mtime = os.path.getmtime(key)
+    with lock:
+        cached = cache.get(key)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        value = loader(key)
+        cache[key] = (mtime, value)
+        return value
+
+
+class CatalogStore:
+    """Process-wide cache of parsed course catalogs.
+
+    Catalogs are keyed by absolute path and invalidated when the file's mtime
+    changes, so each workbook is parsed at most once per process. The returned
+    frames are shared between callers and must be treated as read-only.
+    """
+
+    _catalogs: dict[str, tuple[float, pd.DataFrame]] = {}
+    _lock = threading.Lock()
+
+    @classmethod
+    def get(cls, path) -> pd.DataFrame:
+        return _load_cached(cls._catalogs, cls._lock, path, read_catalog)
+
+    _compiled: dict[str, tuple[float, "CompiledCatalog"]] = {}
+    _compiled_lock = threading.Lock()
+
+    @classmethod
+    def compiled(cls, path) -> "CompiledCatalog":
+        return _load_cached(cls._compiled, cls._compiled_lock, path, cls.compile)
+
+    @classmethod
+    def compile(cls, path, tables: Optional[CatalogTables] = None) -> "CompiledCatalog":
+        """Memory-map the compiled artifact, or parse the workbook if it is missing or stale."""
+        tables = tables if tables is not None else load_tables()
+        artifact = catalog_artifact.artifact_path(path)
+        if catalog_artifact.is_fresh(artifact, path, tables.version):
+            return CompiledCatalog(**catalog_artifact.load(artifact))
+        return CompiledCatalog.from_frame(read_catalog(path), tables)
+
+    @classmethod
+    def clear(cls):
+        with cls._lock:
+            cls._catalogs.clear()
+        with cls._compiled_lock:
+            cls._compiled.clear()
+
+
 class RandomManager:
+    """Serves z-score columns from a process-wide copy of the z-table.
+
+    The table is parsed once and kept as a read-only float64 matrix of
+    rows x seeds in column-major order, so each seed's column is a contiguous
+    view rather than a copy.
+    """
+
     rand_z_table_filepath = "z_score_table.xlsx"
 
-    def __init__(self):
-        self.ztable = pd.read_excel(self.rand_z_table_filepath)
+    _ztables: dict[str, tuple[float, tuple[np.ndarray, dict]]] = {}
+    _lock = threading.Lock()
+
+    def __init__(self, path=None):
+        self.ztable, self.seed_columns = _load_cached(
+            self._ztables,
+            self._lock,
+            path or self.rand_z_table_filepath,
+            self.load_ztable,
+        )
+        self.seed_limit = len(self.seed_columns)
+
+    @staticmethod
+    def load_ztable(path):
+        if web_catalog.is_export(path):
+            frame = web_catalog.read_ztable(path)
+        else:
+            frame = pd.read_excel(path)
+        matrix = np.asfortranarray(frame.to_numpy(dtype=np.float64))
+        matrix.flags.writeable = False
+        seed_columns = {seed: i for i, seed in enumerate(frame.columns)}
+        return matrix, seed_columns
 
     def getRandZSeries(self, seed: int):
-        return self.ztable[seed]
+        return self.ztable[:, self.seed_columns[seed]]
+
+    def zScores(self, rows, seeds) -> np.ndarray:
+        """(len(rows) x len(seeds)) z-scores for the given table rows."""
+        missing = [seed for seed in seeds if seed not in self.seed_columns]
+        if missing:
+            raise ValueError(
+                f"Seeds {missing} are not columns of the z-table; "
+                "use the 'philox' generator for more seeds"
+            )
+        rows = np.asarray(rows, dtype=np.int64)
+        if len(rows) and (rows.min() < 0 or rows.max() >= len(self.ztable)):
+            raise ValueError(
+                f"The z-table only covers {len(self.ztable)} sections; "
+                "use the 'philox' generator for larger catalogs"
+            )
+        columns = [self.seed_columns[seed] for seed in seeds]
+        return self.ztable[np.ix_(rows, columns)]
+
+
+class PhiloxRandomManager:
+    """Draws z-scores on demand from a counter-based generator.
+
+    Each seed keys its own Philox stream and row r takes the r-th output of
+    that stream, so a section's z-score depends only on the seed and the
+    section, and neither seeds nor rows are bounded.
+    """
+
+    seed_limit = None
+
+    def __init__(self, path=None):
+        # Nothing to load; the path is accepted for parity with RandomManager
+        pass
+
+    def zScores(self, rows, seeds) -> np.ndarray:
+        """(len(rows) x len(seeds)) z-scores for the given rows."""
+        rows = np.asarray(rows, dtype=np.int64)
+        raw = np.empty((len(rows), len(seeds)), dtype=np.uint64)
+        if len(rows):
+            count = int(rows.max()) + 1
+            for j, seed in enumerate(seeds):
+                raw[:, j] = np.random.Philox(key=seed).random_raw(count)[rows]
+        # Top 53 bits to a uniform strictly inside (0, 1), then invert the normal CDF
+        uniform = ((raw >> np.uint64(11)).astype(np.float64) + 0.5) * 2.0**-53
+        return ndtri(uniform)
+
+
+RANDOM_MANAGERS = {
+    "table": RandomManager,
+    "philox": PhiloxRandomManager,
+}
+
+
+def get_random_manager(rng: str, ztable=None):
+    """Instantiate a z-score source by name ("table" or "philox").
+
+    ``ztable`` overrides the table the "table" source reads from.
+    """
+    try:
+        return RANDOM_MANAGERS[rng](ztable)
+    except KeyError:
+        raise ValueError(
+            f"Unknown rng {rng!r}; expected one of {sorted(RANDOM_MANAGERS)}"
+        ) from None
 
 
 class PreProcessor(object):
     START_OF_UNIQUEID = 1
+    MIN_PRICE = 0
+    MAX_PRICE = 4851
 
     df: Optional[pd.DataFrame] = None
 
-    def __init__(self):
-        pass
+    def __init__(
+        self,
+        rng: str = "table",
+        sampling: str = "iid",
+        ztable=None,
+        tables: Optional[CatalogTables] = None,
+    ):
+        self.rng = rng
+        self.sampling = sampling
+        self.ztable = ztable
+        self.tables = tables if tables is not None else load_tables()
 
     def preprocess(self, df: pd.DataFrame):
         self.df = df
@@ -86,188 +256,215 @@ class PreProcessor(object):
         self.df = self.df.drop(columns=columns_to_drop)
 
     def preprocess_primary_section_id(self):
-        def rename_course_id(course_id: str):
-            map = {
-                "STAT6130": "FC_STAT",
-                "STAT6210": "FC_STAT",
-                "WHCP6160": "FC_WHCP",
-                "WHCP6180": "FC_WHCP",
-                "ACCT6110": "FC_ACCT",
-                "ACCT6130": "FC_ACCT",
-                "FNCE6110": "FC_FNCE",
-                "FNCE6210": "FC_FNCE",
-                "FNCE6130": "FC_MACRO",
-                "FNCE6230": "FC_MACRO",
-                "MGMT6110": "FC_MGMT",
-                "MGMT6120": "FC_MGMT",
-                "MKTG6120": "FC_MKTG",
-                "MKTG6130": "FC_MKTG",
-                # Cross-listed
-                "ACCT7970": "TABS",  # Taxes and Business Strategy
-                "FNCE7970": "TABS",
-                "BEPP7630": "EMAP",  # Energy Markets and Policy
-                "OIDD7630": "EMAP",
-                "LGST8050": "AABT",  # Antitrust and Big Tech
-                "MKTG7600": "AABT",
-                "LGST8060": "NEGO",  # Negotiations
-                "MGMT6910": "NEGO",
-                "OIDD6910": "NEGO",
-                "LGST8090": "SBM",  # Sports Business Management
-                "MGMT8150": "SBM",
-                "MGMT7290": "IPSIDE",  # Intellectual Property Strategy for the Innovation-Driven Enterprise
-                "LGST7290": "IPSIDE",
-                "OIDD6900": "MDM",  # Managerial Decision Making
-                "MGMT6900": "MDM",
-                "OIDD6930": "INFL",  # Influence
-                "LGST6930": "INFL",
-                "OIDD7610": "RAEM",  # Risk Analysis and Environmental Management
-                "BEPP7610": "RAEM",
-                "REAL7080": "HM",  # Housing Markets
-                "BEPP7080": "HM",
-                "REAL7210": "REIAF",  # Real Estate Investment: Analysis and Financing
-                "FNCE7210": "REIAF",
-                "REAL8040": "REL",  # Real Estate Law
-                "LGST8040": "REL",
-                "REAL8360": "IHC",  # International Housing Comparisons
-                "BEPP8360": "IHC",
-                "STAT7770": "IPDS",  # Introduction to Python for Data Science
-                "OIDD7770": "IPDS",
-                # "MKTG7120": "DAMD", # Data and Analysis for Marketing Decisions - only section id differs
-            }
-            if course_id in map.keys():
-                return map[course_id]
-            return course_id
-
-        def split_primary_section_id(section_id: str):
-            course_id = rename_course_id(section_id[:8])
-            section_code = section_id[8:]
-            return course_id, section_code
-
         # Split into separate columns
         assert self.df is not None
-        self.df[["course_id", "section_code"]] = self.df["primary_section_id"].apply(
-            lambda x: pd.Series(split_primary_section_id(x))
-        )
+        section_ids = self.df["primary_section_id"]
+        self.df["course_id"] = self.tables.course_ids(section_ids)
+        self.df["section_code"] = section_ids.str[8:]
 
     def preprocess_class_time(self):
-        all_classes = set[str]()
-        classes = dict[Hashable, list[str]]()
-        for index, row in self.df.iterrows():
-            part_of_term = row["part_of_term"]
-            days_code = row["days_code"]
-            start_time = row["start_time_24hr"]
-            stop_time = row["stop_time_24hr"]
-
-            terms = self.get_terms(part_of_term)
-            days = self.get_days(days_code)
-            time_class = self.get_time_class(start_time, stop_time)
-
-            combinations = [
-                "ct_" + x + y + z for x in terms for y in days for z in time_class
-            ]
-            classes[index] = combinations
-            for c in combinations:
-                all_classes.add(c)
-
-        # make new columns filled with 0
         assert self.df is not None
-        for c in all_classes:
-            self.df[c] = [0] * len(self.df)
-
-        # mark 1 for each class_time
-        for index, row in self.df.iterrows():
-            for c in classes[index]:
-                self.df.loc[index, c] = 1
-
-    def get_terms(self, part_of_term):
-        part_of_term = str(part_of_term)
-        map = {
-            "1": ["q1"],
-            "2": ["q2"],
-            "3": ["q3"],
-            "4": ["q4"],
-            "F": ["q1", "q2"],
-            "S": ["q3", "q4"],
-            "M": ["mod"],
-            "Modular": ["mod"],
-        }
-        return map[part_of_term]
-
-    def get_days(self, days_code):
-        map = {
-            "M": ["M"],
-            "T": ["T"],
-            "W": ["W"],
-            "R": ["R"],
-            "F": ["F"],
-            "S": ["S"],
-            "U": ["U"],
-            "MW": ["M", "W"],
-            "TR": ["T", "R"],
-            "FS": ["F", "S"],
-            "TBA": ["TBA"],
-        }
-        return map[days_code]
-
-    def get_time_class(self, start_time: datetime.time, stop_time: datetime.time):
-        start_dt = datetime.datetime.combine(datetime.datetime.today(), start_time)
-        stop_dt = datetime.datetime.combine(datetime.datetime.today(), stop_time)
-        duration = (stop_dt - start_dt).total_seconds() / 3600  # HRs
-
-        map = {
-            datetime.time(8, 30, 00): "A",
-            datetime.time(10, 15, 00): "B",
-            datetime.time(12, 00, 00): "C",
-            datetime.time(13, 45, 00): "D",
-            datetime.time(15, 30, 00): "E",
-            datetime.time(17, 15, 00): "F",
-            datetime.time(19, 00, 00): "G",
-            datetime.time(20, 45, 00): "H",
-            datetime.time(22, 30, 00): "I",
-            datetime.time(00, 00, 00): "Z",
-        }
-        if duration > 2:
-            new_start_time = (start_dt + datetime.timedelta(hours=1, minutes=45)).time()
-            return [map[start_time], map[new_start_time]]
-        return [map[start_time]]
-
-    def setupPrice(self, df: pd.DataFrame, seed: int):
-        randomManager = RandomManager()
-        z_series = randomManager.getRandZSeries(seed)
+        labels, matrix = self.class_time_matrix(self.df)
+        class_times = pd.DataFrame(
+            matrix.astype(int), index=self.df.index, columns=labels
+        )
+        self.df = pd.concat([self.df, class_times], axis=1)
+
+    def class_time_matrix(self, df: pd.DataFrame):
+        """Boolean (rows x slots) class-time incidence and its ``ct_*`` labels."""
+        class_times = self.tables.class_times(df)
+        codes, labels = pd.factorize(class_times["label"], sort=True)
+        matrix = np.zeros((len(df), len(labels)), dtype=bool)
+        matrix[class_times["row"].to_numpy(), codes] = True
+        return labels.tolist(), matrix
+
+    def samplePrices(self, df: pd.DataFrame, seeds) -> np.ndarray:
+        """Sample clipped prices for every row of ``df`` under each seed.
+
+        Returns an (n_courses x n_seeds) matrix whose column ``j`` holds the
+        prices drawn with ``seeds[j]`` under the preprocessor's sampling mode.
+        """
+        randomManager = get_random_manager(self.rng, self.ztable)
+        rows = df["uniqueid"].to_numpy(dtype=np.int64) - self.START_OF_UNIQUEID
         # price = price_predicted + resid_mean + z * resid_stdev
-        df["price"] = pd.Series(dtype="float")
-        for index, row in df.iterrows():
-            idx = row["uniqueid"] - PreProcessor.START_OF_UNIQUEID
-            price = (
-                row["price_predicted"]
-                + row["resid_mean"]
-                + z_series[idx] * row["resid_stdev"]
-            )
-            df.loc[index, "price"] = min(4851, max(0, price))
+        mean = (df["price_predicted"] + df["resid_mean"]).to_numpy(dtype=np.float64)
+        stdev = df["resid_stdev"].to_numpy(dtype=np.float64)
+        z = sample_normals(self.sampling, randomManager, rows, seeds, stdev)
+        prices = mean[:, np.newaxis] + z * stdev[:, np.newaxis]
+        return np.clip(prices, self.MIN_PRICE, self.MAX_PRICE)
 
+    def setupPrice(self, df: pd.DataFrame, seed: int):
+        df = df.assign(price=self.samplePrices(df, [seed])[:, 0])
         self.df = df
 
         return df
 
 
+class CompiledCatalog:
+    """A catalog with its input-independent preprocessing done once.
+
+    Course ids, section codes and class-time slots depend only on the
+    catalog, so they are derived up front: slots are kept as a packed
+    course x slot bit matrix and course ids as integer group codes.
+    Requests slice rows out of these instead of rebuilding columns.
+    ``catalog_artifact`` saves these fields so later processes can
+    memory-map them instead of parsing the workbook.
+    """
+
+    def __init__(self, frame, slot_labels, slot_bits, group_codes, group_labels):
+        self.frame = frame
+        self.slot_labels = slot_labels
+        self.slot_bits = slot_bits
+        self.group_codes = group_codes
+        self.group_labels = group_labels
+
+    @classmethod
+    def from_frame(
+        cls, catalog: pd.DataFrame, tables: Optional[CatalogTables] = None
+    ) -> "CompiledCatalog":
+        preprocessor = PreProcessor(tables=tables)
+        preprocessor.df = catalog.copy()
+        preprocessor.preprocess_primary_section_id()
+        frame = preprocessor.df
+        frame["department"] = frame["primary_section_id"].str[:4]
+        frame["quarter"] = (
+            frame["part_of_term"].astype(str).map(preprocessor.tables.quarter_labels)
+        )
+
+        slot_labels, slots = preprocessor.class_time_matrix(frame)
+        slot_bits = np.packbits(slots, axis=1)
+        group_codes, group_labels = pd.factorize(frame["course_id"])
+        slot_bits.flags.writeable = False
+        group_codes.flags.writeable = False
+        return cls(frame, slot_labels, slot_bits, group_codes, group_labels)
+
+    @functools.cached_property
+    def version(self) -> str:
+        """Content hash of the catalog, the same in every process that loads it."""
+        rows = pd.util.hash_pandas_object(self.frame, index=False)
+        digest = hashlib.sha256(rows.to_numpy().tobytes())
+        digest.update("\n".join(self.slot_labels).encode())
+        digest.update(np.ascontiguousarray(self.slot_bits).tobytes())
+        return digest.hexdigest()[:16]
+
+    def rows(self, uniqueids) -> np.ndarray:
+        """Positions of the given sections, in catalog order."""
+        return np.flatnonzero(self.frame["uniqueid"].isin(uniqueids).to_numpy())
+
+    def slots(self, rows) -> np.ndarray:
+        """Boolean (len(rows) x n_slots) class-time incidence for ``rows``."""
+        bits = np.unpackbits(self.slot_bits[rows], axis=1, count=len(self.slot_labels))
+        return bits.view(bool)
+
+
 class CourseMatchSolver(object):
-    def __init__(self, sourceXlsx, candidates):
+    def __init__(
+        self,
+        sourceXlsx,
+        candidates,
+        catalog: Optional[CompiledCatalog] = None,
+        backend: str | SolverBackend = "highs",
+        rng: str = "table",
+        sampling: str = "iid",
+        ztable=None,
+    ):
         self.source = sourceXlsx
         self.candidates = candidates
-        self.source_data = pd.read_excel(sourceXlsx)
+        # Borrow the shared, already-compiled catalog instead of re-reading the workbook
+        self.catalog = (
+            catalog if catalog is not None else CatalogStore.compiled(sourceXlsx)
+        )
+        self.source_data = self.catalog.frame
 
-        self.preprocessor = PreProcessor()
+        self.preprocessor = PreProcessor(rng, sampling, ztable)
+        self.backend = get_backend(backend)
 
     def solve(self):
-        self.unpack(self.candidates)
-        self.mergeData()
-        self.preprocess()
+        self.setup()
         selected = self.solveLP()
         selected_data = self.pack(selected)
 
         return selected_data
         # return example_output
 
+    def setup(self):
+        self.unpack(self.candidates)
+        self.mergeData()
+        self.preprocess()
+        self.backend.load(self.buildModel())
+        self.warm = WarmStartSolver(self.backend, self.budget)
+
+    def samplePrices(self, seeds) -> np.ndarray:
+        """Price scenarios (n_courses x n_seeds) for the prepared candidates."""
+        return self.preprocessor.samplePrices(self.df, seeds)
+
+    def resolve(self, prices):
+        """Re-solve the prepared model under a different price vector."""
+        self.df = self.df.assign(price=prices)
+        selected = self.solveLP()
+        return self.pack(selected)
+
+    def resolveMany(self, price_matrix):
+        """Yield the selected courses under each price column, in order.
+
+        Vectorized backends price the whole matrix at once; others re-solve
+        column by column, warm-started from the previous draw's optimum.
+        """
+        price_matrix = np.asarray(price_matrix, dtype=np.float64)
+        if price_matrix.shape[0] != len(self.df):
+            raise ValueError(
+                f"Expected {len(self.df)} price rows, one per candidate in catalog "
+                f"order, got {price_matrix.shape[0]}"
+            )
+        if self.backend.vectorized:
+            selections = self.backend.solve_all(price_matrix)
+        else:
+            selections = (
+                self.warm.solve(price_matrix[:, j])
+                for j in range(price_matrix.shape[1])
+            )
+        for j, selected in enumerate(selections):
+            yield self.pack(self.selection(selected, price_matrix[:, j]))
+
+    @classmethod
+    def solve_many(
+        cls,
+        sourceXlsx,
+        candidates,
+        seeds=None,
+        price_matrix=None,
+        catalog: Optional[CompiledCatalog] = None,
+        backend: str | SolverBackend = "highs",
+        rng: str = "table",
+        sampling: str = "iid",
+        ztable=None,
+    ) -> list[list[dict]]:
+        """One schedule per price scenario, from a single setup.
+
+        Pass either ``seeds`` to sample one scenario per seed, or a
+        ``price_matrix`` of (n_candidates x n_scenarios) prices whose rows
+        follow the candidates' catalog order. The catalog is shared, and
+        preprocessing and the solver model are built once for every scenario.
+        """
+        if (seeds is None) == (price_matrix is None):
+            raise ValueError("Pass exactly one of seeds or price_matrix")
+        seeds = None if seeds is None else list(seeds)
+        seed = seeds[0] if seeds else candidates.get("seed", 1)
+
+        cms = cls(
+            sourceXlsx,
+            {**candidates, "seed": seed},
+            catalog=catalog,
+            backend=backend,
+            rng=rng,
+            sampling=sampling,
+            ztable=ztable,
+        )
+        cms.setup()
+        if price_matrix is None:
+            price_matrix = cms.samplePrices(seeds)
+        return list(cms.resolveMany(price_matrix))
+
     def unpack(self, data):
         self.budget = data["budget"]
         self.max_credits = data["max_credits"]
@@ -277,107 +474,102 @@ class CourseMatchSolver(object):
         self.utilities = [course["utility"] for course in self.courses]
 
     def mergeData(self):
-        self.df = self.source_data[self.source_data["uniqueid"].isin(self.uniqueids)]
-        self.df["utilities"] = self.utilities
-
-    def preprocess(self):
-        self.df = self.preprocessor.preprocess(self.df)
-        self.df = self.preprocessor.setupPrice(self.df, self.seed)
-
-    def solveLP(self):
-        # Define the linear programming problem
-        prob = LpProblem("Course_Scheduler", LpMaximize)
-
-        # Create binary variables for each row
-        row_vars = {
-            row["uniqueid"]: LpVariable(f"x_{row['uniqueid']}", cat="Binary")
-            for _, row in self.df.iterrows()
-        }
-
-        # Objective function: Maximize the sum of utilities times credits for selected courses
-        prob += (
-            lpSum(
-                row_vars[row["uniqueid"]] * row["utilities"] * row["credit_unit"]
-                for _, row in self.df.iterrows()
-            ),
-            "Total_Utility",
+        # Utilities are matched by uniqueid, since rows come in catalog order
+        # whatever order the courses were listed in
+        utilities = pd.Series(
+            self.utilities,
+            index=np.asarray(self.uniqueids, dtype=np.float64),
+            dtype=np.float64,
         )
-
-        # Constraints
-        # 1. Budget constraint: Sum of prices for selected courses must not exceed the budget
-        prob += (
-            lpSum(
-                [
-                    row["price"] * row_vars[row["uniqueid"]]
-                    for _, row in self.df.iterrows()
-                ]
+        duplicated = utilities.index[utilities.index.duplicated()]
+        if len(duplicated):
+            raise ValueError(
+                f"Sections listed more than once: {sorted(set(duplicated))}"
             )
-            <= self.budget,
-            "Budget_Constraint",
-        )
 
-        # 2. Course unit constraint: Sum of credit_units for selected courses must not exceed the max_credits
-        prob += (
-            lpSum(
-                [
-                    row["credit_unit"] * row_vars[row["uniqueid"]]
-                    for _, row in self.df.iterrows()
-                ]
-            )
-            <= self.max_credits,
-            "Max_Credit_Constraint",
+        # Taking rows copies them, so the shared catalog is never mutated
+        self.rows = self.catalog.rows(utilities.index)
+        uniqueids = self.source_data["uniqueid"].to_numpy()[self.rows]
+        unknown = utilities.index.difference(uniqueids)
+        if len(unknown):
+            raise ValueError(f"Unknown sections: {unknown.tolist()}")
+        self.df = self.source_data.iloc[self.rows].assign(
+            utilities=utilities.loc[uniqueids].to_numpy()
         )
 
-        # 3. Constraints to ensure no duplicate course_id is selected
-        for course_id in self.df["course_id"].unique():
-            prob += (
-                lpSum(
-                    row_vars[row["uniqueid"]]
-                    for _, row in self.df.iterrows()
-                    if row["course_id"] == course_id
-                )
-                <= 1,
-                f"Max_One_{course_id}",
-            )
+    def preprocess(self):
+        self.buildIndexes()
+        self.df = self.preprocessor.setupPrice(self.df, self.seed)
 
-        # 4. Constraints to ensure no two courses at the same time is selected
-        for col in self.df.columns:
-            if col.startswith("ct_"):
-                prob += (
-                    lpSum(
-                        row_vars[row["uniqueid"]]
-                        for _, row in self.df.iterrows()
-                        if row[col] == 1
-                    )
-                    <= 1,
-                    f"No_Overlap_{col}",
-                )
-
-        # Solve the problem
-        prob.solve()
+    def buildIndexes(self):
+        """Map each course group and time slot to the candidate positions in it.
+
+        Only groups and slots shared by two or more candidates can be violated,
+        so the rest are left out.
+        """
+        groups = dict[str, list[int]]()
+        for i, code in enumerate(self.catalog.group_codes[self.rows]):
+            groups.setdefault(self.catalog.group_labels[code], []).append(i)
+
+        slot_members = dict[str, list[int]]()
+        positions, slots = np.nonzero(self.catalog.slots(self.rows))
+        for i, slot in zip(positions.tolist(), slots.tolist()):
+            slot_members.setdefault(self.catalog.slot_labels[slot], []).append(i)
+
+        self.groups = {k: v for k, v in groups.items() if len(v) > 1}
+        self.slot_members = {k: v for k, v in slot_members.items() if len(v) > 1}
+
+    def buildModel(self) -> CourseMatchModel:
+        credits = self.df["credit_unit"].to_numpy(dtype=np.float64)
+        utilities = self.df["utilities"].to_numpy(dtype=np.float64)
+        # Constraints to ensure no duplicate course_id and no two courses at the same time
+        packing = {f"Max_One_{k}": v for k, v in self.groups.items()}
+        packing.update({f"No_Overlap_{k}": v for k, v in self.slot_members.items()})
+
+        return CourseMatchModel(
+            names=self.df["uniqueid"].tolist(),
+            objective=utilities * credits,
+            credits=credits,
+            budget=self.budget,
+            max_credits=self.max_credits,
+            packing=packing,
+        )
+
+    def solveLP(self):
+        prices = self.df["price"].to_numpy(dtype=np.float64)
+        selected = self.warm.solve(prices)
 
         # Print the results
         print("Selected Rows:")
-        selected_rows = [
-            row["uniqueid"]
-            for _, row in self.df.iterrows()
-            if row_vars[row["uniqueid"]].varValue == 1
-        ]
-        print(self.df[self.df["uniqueid"].isin(selected_rows)])
+        print(self.df.iloc[selected])
+
+        return self.selection(selected, prices)
 
-        # Extract the selected rows
-        result = [
-            dict({"uniqueid": row["uniqueid"], "price": row["price"]})
-            for _, row in self.df.iterrows()
-            if row_vars[row["uniqueid"]].varValue == 1
+    def selection(self, selected: list[int], prices) -> list[dict]:
+        """Result rows for the selected candidate positions."""
+        uniqueids = self.df["uniqueid"].tolist()
+        return [
+            dict({"uniqueid": uniqueids[i], "price": float(prices[i])})
+            for i in selected
         ]
-        return result
 
     def pack(self, data):
         return data
 
 
 if __name__ == "__main__":
-    cms = CourseMatchSolver("data_spring_2025.xlsx", example_input)
+    import sys
+
+    from terms import TermRegistry
+
+    # Solve the example against the given term, or the workbook it was written for
+    registry = TermRegistry()
+    term = registry.terms[sys.argv[1] if len(sys.argv) > 1 else "2025A"]
+    cms = CourseMatchSolver(
+        term.catalog_path,
+        example_input,
+        catalog=registry.catalog(term.term_id),
+        ztable=term.ztable_path,
+    )
     selected = cms.solve()
     print(selected)
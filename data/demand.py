@@ -0,0 +1,168 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+from batch import read_students, run_batch
+from coursematch_solver import CompiledCatalog
+from terms import TermRegistry
+
+
+def synthetic_profiles(
+    catalog: CompiledCatalog,
+    term_id: str,
+    students: int,
+    seed: int = 0,
+    sections: tuple[int, int] = (6, 14),
+    budget: tuple[float, float] = (4000, 5000),
+    max_credits: tuple[float, ...] = (4.0, 4.5, 5.0, 5.5),
+) -> dict[str, dict]:
+    """Random student inputs shaped like ``example_input``.
+
+    Each student lists a uniform number of sections in the ``sections``
+    range, drawn without replacement with weight proportional to the
+    section's predicted price, so historically popular sections are
+    listed more often. Utilities are uniform on 1..100, budgets uniform
+    on the ``budget`` range and credit limits one of ``max_credits``.
+
+    Ids name the term and seed, ``synthetic-<term>-<seed>-<n>``, so cohorts
+    drawn for different terms or seeds never share a student id.
+    """
+    rng = np.random.default_rng(seed)
+    frame = catalog.frame
+    uniqueids = frame["uniqueid"].to_numpy(dtype=np.float64)
+    weights = frame["price_predicted"].clip(lower=0).fillna(0).to_numpy() + 1.0
+    weights /= weights.sum()
+
+    profiles = {}
+    for student in range(students):
+        count = min(rng.integers(sections[0], sections[1] + 1), len(uniqueids))
+        picked = rng.choice(len(uniqueids), size=count, replace=False, p=weights)
+        profiles[f"synthetic-{term_id}-{seed}-{student:05d}"] = {
+            "budget": float(np.round(rng.uniform(*budget))),
+            "max_credits": float(rng.choice(max_credits)),
+            "courses": [
+                {"uniqueid": float(uniqueids[i]), "utility": int(rng.integers(1, 101))}
+                for i in picked
+            ],
+        }
+    return profiles
+
+
+def read_results(path) -> pd.DataFrame:
+    """Batch results (student, seed, schedule) from JSONL or a Parquet directory.
+
+    A pair written more than once, after its student's input changed, keeps
+    its latest record.
+    """
+    if str(path).rstrip(os.sep).endswith(".parquet"):
+        results = pd.read_parquet(path)
+    else:
+        results = pd.read_json(path, lines=True, dtype={"student": str})
+    return results.drop_duplicates(["student", "seed"], keep="last")
+
+
+def demand_report(
+    results: pd.DataFrame, catalog: CompiledCatalog, scale: float = 1.0
+) -> pd.DataFrame:
+    """Demand for each section against its capacity, most congested first.
+
+    Each seed is one market: every student faces the same sampled prices,
+    so a section's demand in that market is the number of students whose
+    schedule includes it, times ``scale`` when the profiles are a sample of
+    the cohort. Per section the report gives capacity, mean and maximum
+    demand over markets, utilization (mean demand over capacity), the
+    share of markets where demand exceeds capacity, and the mean number of
+    students over capacity.
+    """
+    seeds = np.sort(results["seed"].unique())
+    chosen = results[["seed", "schedule"]].explode("schedule").dropna()
+    chosen = pd.DataFrame(
+        {
+            "seed": chosen["seed"].to_numpy(),
+            "uniqueid": [row["uniqueid"] for row in chosen["schedule"]],
+        }
+    )
+
+    sections = catalog.frame.set_index("uniqueid")[
+        ["primary_section_id", "title", "capacity"]
+    ]
+    demand = (
+        chosen.groupby(["uniqueid", "seed"]).size().unstack(fill_value=0) * scale
+    ).reindex(index=sections.index, columns=seeds, fill_value=0)
+
+    capacity = sections["capacity"]
+    mean_demand = demand.mean(axis=1)
+    report = sections.assign(
+        mean_demand=mean_demand,
+        max_demand=demand.max(axis=1),
+        utilization=mean_demand / capacity,
+        p_oversubscribed=demand.gt(capacity, axis=0).mean(axis=1),
+        mean_excess=demand.sub(capacity, axis=0).clip(lower=0).mean(axis=1),
+    )
+    return report.sort_values(
+        ["utilization", "p_oversubscribed"], ascending=False
+    ).reset_index()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Aggregate simulated cohort demand per section against capacity"
+    )
+    parser.add_argument("report", help="CSV file for the oversubscription report")
+    parser.add_argument(
+        "--profiles", help="Directory or JSONL of student inputs (default: synthetic)"
+    )
+    parser.add_argument(
+        "--students", type=int, default=800, help="Synthetic students to generate"
+    )
+    parser.add_argument("--profile-seed", type=int, default=0)
+    parser.add_argument("--scale", type=float, default=1.0)
+    parser.add_argument("--term", help="Term id (default: the latest)")
+    parser.add_argument("--seeds", type=int, default=10, help="Markets to simulate")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--backend", default="highs")
+    parser.add_argument(
+        "--results",
+        help="Batch output to write and resume from (default: "
+        "<report>-<term>[-seed<profile seed>]-<backend>.jsonl)",
+    )
+    args = parser.parse_args()
+
+    registry = TermRegistry(capacity=1)
+    term_id = args.term or registry.latest
+    catalog = registry.catalog(term_id)
+    run = [os.path.splitext(args.report)[0], term_id]
+    if args.profiles:
+        profiles = read_students(args.profiles)
+    else:
+        profiles = synthetic_profiles(
+            catalog, term_id, args.students, args.profile_seed
+        )
+        run.append(f"seed{args.profile_seed}")
+    run.append(args.backend)
+    results_path = args.results or "-".join(run) + ".jsonl"
+
+    run_batch(
+        profiles,
+        results_path,
+        term_id=term_id,
+        seeds=list(range(1, args.seeds + 1)),
+        workers=args.workers,
+        backend=args.backend,
+    )
+    results = read_results(results_path)
+    report = demand_report(
+        results[results["student"].isin(list(profiles))], catalog, args.scale
+    )
+    report.to_csv(args.report, index=False)
+
+    oversubscribed = report[report["utilization"] > 1]
+    print(
+        f"{len(oversubscribed)} of {len(report)} sections oversubscribed on average",
+        file=sys.stderr,
+    )
+    print(oversubscribed.head(20).to_string(index=False), file=sys.stderr)
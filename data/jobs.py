@@ -0,0 +1,189 @@
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from montecarlo import MonteCarloSimulator, SimulationTally
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+CANCELLED = "cancelled"
+
+
+class QueueFull(RuntimeError):
+    """Raised by JobQueue.submit when too many jobs are already waiting or running."""
+
+
+class Job:
+    """One submitted simulation and what is known about it so far."""
+
+    def __init__(self, job_id: str, num_simulations: int):
+        self.id = job_id
+        self.status = QUEUED
+        self.draws = 0
+        self.total = num_simulations
+        self.partial = None
+        self.result = None
+        self.error = None
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.future = None
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (DONE, FAILED, CANCELLED)
+
+    def snapshot(self) -> dict:
+        return {
+            "id": self.id,
+            "status": self.status,
+            "draws": self.draws,
+            "total": self.total,
+            "partial": self.partial,
+            "result": self.result,
+            "error": self.error,
+            "submitted_at": self.submitted_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class JobQueue:
+    """Runs simulations on a bounded pool of worker threads.
+
+    ``submit`` returns a job id at once; ``poll`` reports the job's status,
+    progress, latest partial probabilities and, once done, its result. At
+    most ``workers`` simulations run at a time and at most ``max_pending``
+    may be queued or running, beyond which submit raises QueueFull. The
+    last ``keep_finished`` finished jobs stay pollable.
+
+    With a SimulationCache, jobs go through it, so identical profiles are
+    simulated once no matter how many students submit them.
+    """
+
+    # Minimum seconds between partial-result snapshots of a running job
+    PARTIAL_INTERVAL = 0.25
+
+    def __init__(
+        self,
+        workers: int = 2,
+        max_pending: int = 32,
+        keep_finished: int = 256,
+        cache=None,
+    ):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.keep_finished = keep_finished
+        self.cache = cache
+        self._executor = ThreadPoolExecutor(workers, thread_name_prefix="simulation")
+        self._jobs: OrderedDict[str, Job] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def pending(self) -> int:
+        """Jobs queued or running."""
+        with self._lock:
+            return sum(not job.finished for job in self._jobs.values())
+
+    def submit(
+        self,
+        simulator: MonteCarloSimulator,
+        base_input,
+        num_simulations: int,
+        **options,
+    ) -> str:
+        """Queue a simulation; options are passed to run_simulation."""
+        with self._lock:
+            pending = sum(not job.finished for job in self._jobs.values())
+            if pending >= self.max_pending:
+                raise QueueFull(
+                    f"{pending} simulations are already queued or running; "
+                    "try again shortly"
+                )
+            job = Job(uuid.uuid4().hex, num_simulations)
+            self._jobs[job.id] = job
+            job.future = self._executor.submit(
+                self._run, job, simulator, base_input, num_simulations, options
+            )
+        return job.id
+
+    def poll(self, job_id: str) -> dict:
+        """A snapshot of the job; KeyError if it is unknown or was forgotten."""
+        with self._lock:
+            return self._jobs[job_id].snapshot()
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a job that has not started yet."""
+        with self._lock:
+            job = self._jobs[job_id]
+            if job.status != QUEUED or not job.future.cancel():
+                return False
+            job.status = CANCELLED
+            job.finished_at = time.time()
+            self._forget_finished()
+            return True
+
+    def shutdown(self, wait: bool = True):
+        self._executor.shutdown(wait=wait, cancel_futures=True)
+
+    def _run(self, job: Job, simulator, base_input, num_simulations, options):
+        with self._lock:
+            job.status = RUNNING
+            job.started_at = time.time()
+
+        tally = SimulationTally(options.get("keep_raw", False))
+        confidence = options.get("confidence", 0.95)
+        last_partial = 0.0
+
+        def progress(draws, total):
+            nonlocal last_partial
+            now = time.monotonic()
+            partial = None
+            if now - last_partial >= self.PARTIAL_INTERVAL:
+                partial = tally.summary(confidence)
+                last_partial = now
+            with self._lock:
+                job.draws = draws
+                if partial is not None:
+                    job.partial = partial
+
+        try:
+            if self.cache is not None:
+                result = self.cache.run(
+                    simulator,
+                    base_input,
+                    num_simulations,
+                    callback=progress,
+                    tally=tally,
+                    **options,
+                )
+            else:
+                result = simulator.run_simulation(
+                    base_input,
+                    num_simulations,
+                    callback=progress,
+                    tally=tally,
+                    **options,
+                )
+        except Exception as error:
+            with self._lock:
+                job.status = FAILED
+                job.error = f"{type(error).__name__}: {error}"
+                job.finished_at = time.time()
+                self._forget_finished()
+            return
+
+        with self._lock:
+            job.status = DONE
+            job.result = result
+            job.draws = result["num_simulations"]
+            job.finished_at = time.time()
+            self._forget_finished()
+
+    def _forget_finished(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[: max(0, len(finished) - self.keep_finished)]:
+            del self._jobs[job_id]
@@ -1,68 +1,348 @@
-from coursematch_solver import CourseMatchSolver
-from collections import Counter
+from coursematch_solver import CatalogStore, CourseMatchSolver, get_random_manager
+from backends import ScheduleCache, WarmStartSolver, get_backend
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from statistics import NormalDist
+from typing import Optional
+import math
+import multiprocessing
+import threading
+import uuid
 
+# Process pools shared by every simulation in this process, by worker count,
+# started on first use
+_pools: dict[int, ProcessPoolExecutor] = {}
+_pools_lock = threading.Lock()
 
-class MonteCarloSimulator:
-    def __init__(self, source_xlsx):
-        self.source_xlsx = source_xlsx
+# Solvers a pool worker has loaded, by run, least recently used first
+_worker_solvers = OrderedDict()
+# Runs a worker keeps solvers for; simulations running at once share a pool
+_WORKER_RUNS = 4
 
-    def run_simulation(self, base_input, num_simulations: int, callback=None):
-        """
-        Runs Monte Carlo simulation multiple times with different seeds
 
-        Args:
-            base_input (dict): Base input with budget, max_credits, and courses
-            num_simulations (int): Number of simulations to run
-            callback (function): Optional callback function for progress updates
+def _get_pool(workers: int) -> ProcessPoolExecutor:
+    with _pools_lock:
+        # A pool whose worker died fails every later submit, so it is replaced
+        if workers not in _pools or _pools[workers]._broken:
+            # Simulations run on threads of the app and the service, and
+            # forking a threaded process can copy locks held by other threads
+            context = multiprocessing.get_context("forkserver")
+            # Workers fork from a server that has the solvers imported
+            context.set_forkserver_preload(["montecarlo"])
+            _pools[workers] = ProcessPoolExecutor(workers, mp_context=context)
+        return _pools[workers]
 
-        Returns:
-            dict: Course probabilities, schedule probabilities, and raw results
+
+def _worker_solver(run, model, backend, schedule_cache):
+    solver = _worker_solvers.pop(run, None)
+    if solver is None:
+        solver = get_backend(backend)
+        solver.load(model)
+        solver = WarmStartSolver(solver, model.budget)
+        if schedule_cache:
+            solver = ScheduleCache(solver, model)
+    _worker_solvers[run] = solver
+    while len(_worker_solvers) > _WORKER_RUNS:
+        _worker_solvers.popitem(last=False)
+    return solver
+
+
+def _solve_chunk(run, prices):
+    solver = _worker_solver(*run)
+    return [solver.solve(prices[:, j]) for j in range(prices.shape[1])]
+
+
+def wilson_interval(count: int, draws: int, confidence: float = 0.95):
+    """Wilson score interval for a probability observed count times in draws"""
+    if draws == 0:
+        return (0.0, 1.0)
+    z = NormalDist().inv_cdf(0.5 + confidence / 2)
+    p = count / draws
+    denominator = 1 + z**2 / draws
+    center = (p + z**2 / (2 * draws)) / denominator
+    half_width = z * math.sqrt(p * (1 - p) / draws + z**2 / (4 * draws**2))
+    half_width /= denominator
+    return (max(0.0, center - half_width), min(1.0, center + half_width))
+
+
+class SimulationTally:
+    """Running course and schedule counts over the draws seen so far"""
+
+    def __init__(self, keep_raw: bool = False):
+        self.draws = 0
+        self.course_counts = Counter()
+        self.schedule_counter = Counter()
+        self.raw_results = [] if keep_raw else None
+
+    def add(self, selected):
+        """Counts one draw's selected courses."""
+        self.draws += 1
+        if self.raw_results is not None:
+            self.raw_results.append(selected)
+
+        # Create a frozen set of course IDs for this schedule
+        schedule = frozenset(course["uniqueid"] for course in selected)
+        self.schedule_counter[schedule] += 1
+        self.course_counts.update(schedule)
+
+    def merge(self, other: "SimulationTally"):
+        """Counts the draws another tally has seen."""
+        self.draws += other.draws
+        self.course_counts.update(other.course_counts)
+        self.schedule_counter.update(other.schedule_counter)
+        if self.raw_results is not None and other.raw_results is not None:
+            self.raw_results.extend(other.raw_results)
+
+    def intervals(self, confidence: float = 0.95):
         """
-        simulation_results = []
-        schedule_counter = Counter()
+        Confidence intervals over the draws counted so far
 
-        for i in range(num_simulations):
-            # Update seed for this iteration
-            current_input = base_input.copy()
-            current_input["seed"] = i + 1
+        Returns:
+            dict: (low, high) per course probability and for the most likely
+            schedule's probability
+        """
+        top = self.schedule_counter.most_common(1)
+        return {
+            "confidence": confidence,
+            "courses": {
+                uniqueid: wilson_interval(count, self.draws, confidence)
+                for uniqueid, count in self.course_counts.items()
+            },
+            "top_schedule": wilson_interval(
+                top[0][1] if top else 0, self.draws, confidence
+            ),
+        }
 
-            # Run solver
-            cms = CourseMatchSolver(self.source_xlsx, current_input)
-            selected = cms.solve()
-            simulation_results.append(selected)
+    def precision(self, confidence: float = 0.95) -> float:
+        """Widest interval half-width among the courses and the top schedule"""
+        intervals = self.intervals(confidence)
+        bounds = [*intervals["courses"].values(), intervals["top_schedule"]]
+        return max((high - low) / 2 for low, high in bounds)
 
-            # Create a frozen set of course IDs for this schedule
-            schedule = frozenset(course["uniqueid"] for course in selected)
-            schedule_counter[schedule] += 1
+    def summary(self, confidence: float = 0.95):
+        """
+        Probabilities over the draws counted so far
 
-            # Update progress if callback provided
-            if callback:
-                callback(i + 1, num_simulations)
+        Returns:
+            dict: Course probabilities, schedule probabilities, their
+            confidence intervals, and raw results when they are kept
+        """
+        draws = max(self.draws, 1)
 
         # Calculate individual course probabilities
-        course_counts = {}
-        for result in simulation_results:
-            for course in result:
-                uniqueid = course["uniqueid"]
-                course_counts[uniqueid] = course_counts.get(uniqueid, 0) + 1
-
         course_probabilities = {
-            uniqueid: count / num_simulations
-            for uniqueid, count in course_counts.items()
+            uniqueid: count / draws for uniqueid, count in self.course_counts.items()
         }
 
         # Calculate schedule probabilities
         schedule_probabilities = [
             {
                 "courses": list(schedule),
-                "probability": count / num_simulations,
+                "probability": count / draws,
                 "count": count,
             }
-            for schedule, count in schedule_counter.most_common()
+            for schedule, count in self.schedule_counter.most_common()
         ]
 
-        return {
+        results = {
             "course_probabilities": course_probabilities,
             "schedule_probabilities": schedule_probabilities,
-            "raw_results": simulation_results,
+            "num_simulations": self.draws,
+            "intervals": self.intervals(confidence),
         }
+        if self.raw_results is not None:
+            results["raw_results"] = self.raw_results
+        return results
+
+
+class MonteCarloSimulator:
+    # Chunks per worker, so faster workers pick up the slack of slower ones
+    CHUNKS_PER_WORKER = 4
+    # Fewest draws worth sending to a process pool
+    PARALLEL_DRAWS = 200
+
+    def __init__(
+        self,
+        source_xlsx,
+        backend="highs",
+        rng="table",
+        sampling="iid",
+        schedule_cache=False,
+        catalog=None,
+        ztable=None,
+    ):
+        self.source_xlsx = source_xlsx
+        self.backend = backend
+        self.rng = rng
+        self.sampling = sampling
+        # A catalog already loaded elsewhere, e.g. by a TermRegistry
+        self.catalog = catalog
+        self.ztable = ztable
+        # Answer draws from schedules already found where that is provably optimal
+        self.schedule_cache = schedule_cache
+
+    def run_simulation(
+        self,
+        base_input,
+        num_simulations: int,
+        callback=None,
+        workers: int = 1,
+        keep_raw: bool = False,
+        precision: Optional[float] = None,
+        confidence: float = 0.95,
+        batch_size: int = 32,
+        tally: Optional[SimulationTally] = None,
+    ):
+        """
+        Runs Monte Carlo simulation multiple times with different seeds
+
+        With a target precision, draws run in batches until every course
+        probability and the top schedule's probability have a confidence
+        interval of at most +/- precision, or num_simulations is reached.
+
+        Args:
+            base_input (dict): Base input with budget, max_credits, and courses
+            num_simulations (int): Number of simulations to run, or the cap
+                when a precision is given
+            callback (function): Optional callback function for progress updates
+            workers (int): Number of processes to shard the seeds across;
+                runs under PARALLEL_DRAWS draws stay in this process
+            keep_raw (bool): Also return every draw's selected courses
+            precision (float): Target interval half-width, e.g. 0.03
+            confidence (float): Confidence level of the intervals
+            batch_size (int): Draws between precision checks
+            tally (SimulationTally): Tally to count into, so a callback can
+                read partial results; a new one by default
+
+        Returns:
+            dict: Course probabilities, schedule probabilities, the achieved
+            intervals, and raw results when keep_raw is set
+        """
+        if tally is None:
+            tally = SimulationTally(keep_raw)
+        until = None
+        if precision is not None:
+
+            def until(tally):
+                return tally.precision(confidence) <= precision
+
+        else:
+            batch_size = None
+
+        for _ in self.stream(
+            base_input, num_simulations, workers, tally, batch_size, until
+        ):
+            # Update progress if callback provided
+            if callback:
+                callback(tally.draws, num_simulations)
+
+        results = tally.summary(confidence)
+        if precision is not None:
+            results["converged"] = until(tally)
+        return results
+
+    def stream(
+        self,
+        base_input,
+        num_simulations: int,
+        workers: int = 1,
+        tally: Optional[SimulationTally] = None,
+        batch_size: Optional[int] = None,
+        until=None,
+    ):
+        """
+        Yields each draw's selected courses as it finishes, in seed order
+
+        When a tally is given it is updated before each draw is yielded, so
+        tally.summary() gives the partial probabilities at any point. Draws
+        are priced and solved batch_size seeds at a time (all at once by
+        default), and the stream ends early once until(tally) holds after a
+        batch.
+        """
+        # The z-table only holds so many seed columns
+        seed_limit = get_random_manager(self.rng, self.ztable).seed_limit
+        if seed_limit is not None and num_simulations > seed_limit:
+            raise ValueError(
+                f"The z-table only holds {seed_limit} draws, not {num_simulations}; "
+                "use the 'philox' generator for more draws"
+            )
+        seeds = [i + 1 for i in range(num_simulations)]
+        if not seeds:
+            return
+        batch_size = batch_size or num_simulations
+
+        # Prepare the candidates once
+        cms = CourseMatchSolver(
+            self.source_xlsx,
+            {**base_input, "seed": seeds[0]},
+            catalog=(
+                self.catalog
+                if self.catalog is not None
+                else CatalogStore.compiled(self.source_xlsx)
+            ),
+            backend=self.backend,
+            rng=self.rng,
+            sampling=self.sampling,
+            ztable=self.ztable,
+        )
+        cms.setup()
+
+        # A vectorized backend solves a whole batch in one go, in this process
+        vectorized = cms.backend.vectorized
+        if self.schedule_cache and not vectorized:
+            cms.warm = ScheduleCache(cms.warm, cms.buildModel())
+
+        # Small runs finish before a pool could be of help
+        parallel = (
+            workers > 1 and not vectorized and num_simulations >= self.PARALLEL_DRAWS
+        )
+        if parallel:
+            pool = _get_pool(workers)
+            # Workers load the model on their first chunk of this run
+            run = (
+                uuid.uuid4().hex,
+                cms.buildModel(),
+                self.backend,
+                self.schedule_cache,
+            )
+
+        for start in range(0, num_simulations, batch_size):
+            # Draw every price scenario of the batch in one call
+            price_matrix = cms.samplePrices(seeds[start : start + batch_size])
+
+            if parallel:
+                selections = self.solve_parallel(pool, run, price_matrix, workers)
+                draws = (
+                    cms.selection(selected, price_matrix[:, i])
+                    for i, selected in enumerate(selections)
+                )
+            else:
+                draws = cms.resolveMany(price_matrix)
+
+            for selected in draws:
+                if tally is not None:
+                    tally.add(selected)
+                yield selected
+
+            if until is not None and until(tally):
+                return
+
+    def solve_parallel(self, pool, run, price_matrix, workers: int):
+        """
+        Solves every price column of price_matrix on a process pool
+
+        Each worker loads the run's model once and solves chunks of draws. A
+        draw's schedule depends only on its prices, so the result matches a
+        serial run seed for seed.
+
+        Yields:
+            list: Selected candidate positions per draw, in column order
+        """
+        total = price_matrix.shape[1]
+        chunk = max(1, math.ceil(total / (workers * self.CHUNKS_PER_WORKER)))
+        futures = [
+            pool.submit(_solve_chunk, run, price_matrix[:, start : start + chunk])
+            for start in range(0, total, chunk)
+        ]
+        for future in futures:
+            yield from future.result()
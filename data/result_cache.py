@@ -0,0 +1,310 @@
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Optional
+
+from coursematch_solver import CatalogStore, CompiledCatalog, CourseMatchSolver
+from montecarlo import MonteCarloSimulator, SimulationTally
+
+
+def fingerprint(
+    candidates,
+    catalog: CompiledCatalog,
+    backend="highs",
+    rng: str = "table",
+    sampling: str = "iid",
+    ztable=None,
+    **options,
+) -> str:
+    """Canonical hash of everything a solve or simulation depends on.
+
+    Courses are keyed by uniqueid regardless of the order they were listed
+    in, and numbers are compared as floats, so ``{"uniqueid": 21}`` and
+    ``{"uniqueid": 21.0}`` are the same request. The z-table is identified
+    by its resolved path, size and mtime. ``options`` are any further
+    JSON-serializable settings that change the result.
+    """
+    courses = sorted(
+        (float(course["uniqueid"]), float(course["utility"]))
+        for course in candidates["courses"]
+    )
+    if rng == "table":
+        path = os.path.abspath(ztable or "z_score_table.xlsx")
+        stat = os.stat(path)
+        ztable = [path, stat.st_size, stat.st_mtime_ns]
+    request = {
+        "budget": float(candidates["budget"]),
+        "max_credits": float(candidates["max_credits"]),
+        "seed": int(candidates["seed"]) if "seed" in candidates else None,
+        "courses": courses,
+        "catalog": catalog.version,
+        "backend": backend if isinstance(backend, str) else type(backend).__name__,
+        "rng": rng,
+        "sampling": sampling,
+        "ztable": ztable,
+        "options": options,
+    }
+    encoded = json.dumps(request, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(encoded.encode()).hexdigest()
+
+
+class ResultCache:
+    """Solved schedules keyed by request fingerprint.
+
+    The most recent ``capacity`` results are kept in memory in LRU order.
+    With a ``path``, every result is also written to a SQLite file, which
+    answers memory misses and survives restarts; it keeps roughly the last
+    ``max_rows`` results written, older ones are deleted first. Hits skip
+    catalog preprocessing and the solve altogether.
+    """
+
+    def __init__(self, capacity: int = 1024, path=None, max_rows: int = 100_000):
+        self.capacity = capacity
+        self.max_rows = max_rows
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._memory: OrderedDict[str, list[dict]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._db = None
+        if path is not None:
+            self._db = sqlite3.connect(path, check_same_thread=False)
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value TEXT)"
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+                "size": len(self._memory),
+            }
+
+    def get(self, key: str) -> Optional[list[dict]]:
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                self.hits += 1
+                return [dict(row) for row in self._memory[key]]
+            row = None
+            if self._db is not None:
+                row = self._db.execute(
+                    "SELECT value FROM results WHERE key = ?", (key,)
+                ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            result = json.loads(row[0])
+            self._remember(key, result)
+            return [dict(row) for row in result]
+
+    def put(self, key: str, result: list[dict]):
+        result = [dict(row) for row in result]
+        with self._lock:
+            self._remember(key, result)
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO results VALUES (?, ?)",
+                    (key, json.dumps(result)),
+                )
+                # Rows get increasing rowids as they are written, so this
+                # drops the oldest ones, keeping at most max_rows
+                self._db.execute(
+                    "DELETE FROM results WHERE rowid <= "
+                    "(SELECT max(rowid) FROM results) - ?",
+                    (self.max_rows,),
+                )
+                self._db.commit()
+
+    def _remember(self, key: str, result: list[dict]):
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.capacity:
+            self._memory.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._memory.clear()
+            if self._db is not None:
+                self._db.execute("DELETE FROM results")
+                self._db.commit()
+
+    def solve(
+        self,
+        sourceXlsx,
+        candidates,
+        catalog: Optional[CompiledCatalog] = None,
+        backend="highs",
+        rng: str = "table",
+        sampling: str = "iid",
+        ztable=None,
+    ) -> list[dict]:
+        """``CourseMatchSolver(...).solve()``, answered from the cache when possible."""
+        if catalog is None:
+            catalog = CatalogStore.compiled(sourceXlsx)
+        key = fingerprint(candidates, catalog, backend, rng, sampling, ztable)
+        result = self.get(key)
+        if result is None:
+            result = CourseMatchSolver.solve_many(
+                sourceXlsx,
+                candidates,
+                seeds=[candidates["seed"]],
+                catalog=catalog,
+                backend=backend,
+                rng=rng,
+                sampling=sampling,
+                ztable=ztable,
+            )[0]
+            self.put(key, result)
+        return result
+
+
+class _Relay(SimulationTally):
+    """The tally of an in-flight simulation, relayed to everyone waiting on it.
+
+    Each caller's tally catches up on the draws counted so far when it
+    joins and then counts every later draw, and each caller's callback
+    hears every progress update.
+    """
+
+    def __init__(self, keep_raw: bool = False):
+        super().__init__(keep_raw)
+        self._callers: list[tuple[Optional[SimulationTally], object]] = []
+        self._lock = threading.Lock()
+
+    def join(self, tally: Optional[SimulationTally], callback):
+        with self._lock:
+            if tally is not None:
+                tally.merge(self)
+            self._callers.append((tally, callback))
+
+    def add(self, selected):
+        with self._lock:
+            super().add(selected)
+            for tally, _ in self._callers:
+                if tally is not None:
+                    tally.add(selected)
+
+    def progress(self, draws: int, total: int):
+        with self._lock:
+            callbacks = [callback for _, callback in self._callers if callback]
+        for callback in callbacks:
+            callback(draws, total)
+
+
+class SimulationCache:
+    """Monte Carlo results shared by every caller in the process.
+
+    Entries expire ``ttl`` seconds after they were computed and at most
+    ``capacity`` are kept, least recently used first out. Concurrent calls
+    for the same request are single-flight: the first one runs the
+    simulation and the rest wait for its result instead of starting their
+    own. Every caller's tally and progress callback follow the draws as
+    they come in, whichever caller runs them.
+    """
+
+    def __init__(self, capacity: int = 256, ttl: float = 3600.0):
+        self.capacity = capacity
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self._entries: OrderedDict[str, tuple[float, dict]] = OrderedDict()
+        self._inflight: dict[str, tuple[Future, _Relay]] = {}
+        self._lock = threading.Lock()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "coalesced": self.coalesced,
+                "size": len(self._entries),
+                "inflight": len(self._inflight),
+            }
+
+    def key(self, simulator: MonteCarloSimulator, base_input, **options) -> str:
+        catalog = simulator.catalog
+        if catalog is None:
+            catalog = CatalogStore.compiled(simulator.source_xlsx)
+        # Draws use seeds 1..n whatever the input says, workers only change
+        # how they are spread, and a tally only observes them
+        options.pop("workers", None)
+        options.pop("tally", None)
+        return fingerprint(
+            {k: v for k, v in base_input.items() if k != "seed"},
+            catalog,
+            simulator.backend,
+            simulator.rng,
+            simulator.sampling,
+            simulator.ztable,
+            schedule_cache=simulator.schedule_cache,
+            **options,
+        )
+
+    def run(
+        self,
+        simulator: MonteCarloSimulator,
+        base_input,
+        num_simulations: int,
+        callback=None,
+        **options,
+    ) -> dict:
+        """``simulator.run_simulation(...)``, shared with identical requests."""
+        key = self.key(
+            simulator, base_input, num_simulations=num_simulations, **options
+        )
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > time.monotonic():
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return copy.deepcopy(entry[1])
+            self._entries.pop(key, None)
+            flight = self._inflight.get(key)
+            leader = flight is None
+            if leader:
+                relay = _Relay(options.get("keep_raw", False))
+                flight = self._inflight[key] = (Future(), relay)
+                self.misses += 1
+            else:
+                self.coalesced += 1
+
+        future, relay = flight
+        relay.join(options.pop("tally", None), callback)
+        if not leader:
+            return copy.deepcopy(future.result())
+
+        try:
+            results = simulator.run_simulation(
+                base_input,
+                num_simulations,
+                callback=relay.progress,
+                tally=relay,
+                **options,
+            )
+        except BaseException as error:
+            with self._lock:
+                del self._inflight[key]
+            future.set_exception(error)
+            raise
+
+        with self._lock:
+            del self._inflight[key]
+            self._entries[key] = (time.monotonic() + self.ttl, results)
+            while len(self._entries) > self.capacity:
+                self._entries.popitem(last=False)
+        future.set_result(results)
+        return copy.deepcopy(results)
@@ -0,0 +1,133 @@
+import warnings
+
+import numpy as np
+from scipy.special import ndtri
+from scipy.stats import qmc
+
+SAMPLING_MODES = ("iid", "antithetic", "sobol", "lhs", "stratified")
+
+# Keeps inverse-CDF inputs strictly inside (0, 1)
+_EPSILON = 2.0**-53
+
+
+def _normals(uniform) -> np.ndarray:
+    return ndtri(np.clip(uniform, _EPSILON, 1 - _EPSILON))
+
+
+def antithetic(randomManager, rows, seeds) -> np.ndarray:
+    """Pairs each seed's z-scores with their negation.
+
+    Draws 2k and 2k + 1 use seeds[2k] as z and -z, so their prices move in
+    opposite directions around the mean.
+    """
+    z = randomManager.zScores(rows, seeds[::2])
+    paired = np.empty((len(rows), 2 * z.shape[1]))
+    paired[:, 0::2] = z
+    paired[:, 1::2] = -z
+    return paired[:, : len(seeds)]
+
+
+def sobol(rows, draws: int, seed: int) -> np.ndarray:
+    """Scrambled Sobol normals, one dimension per row.
+
+    Only a power-of-two number of draws keeps the points balanced; other
+    counts take the first ``draws`` points of the next power of two and
+    warn, as ``scipy.stats.qmc.Sobol.random`` does.
+    """
+    m = max(0, int(np.ceil(np.log2(max(draws, 1)))))
+    if draws != 2**m:
+        warnings.warn(
+            f"Sobol sampling with {draws} draws, not a power of two, "
+            "loses the balance of the point set",
+            stacklevel=3,
+        )
+    points = qmc.Sobol(d=len(rows), scramble=True, seed=seed).random_base2(m)
+    return _normals(points[:draws].T)
+
+
+def latin_hypercube(rows, draws: int, seed: int) -> np.ndarray:
+    """Latin hypercube normals, one dimension per row."""
+    points = qmc.LatinHypercube(d=len(rows), seed=seed).random(draws)
+    return _normals(points.T)
+
+
+def stratified(randomManager, rows, seeds, sensitivity, strata_courses: int = 3):
+    """Stratifies the most price-sensitive rows and draws the rest i.i.d.
+
+    Each of the ``strata_courses`` rows with the largest ``sensitivity`` gets
+    exactly one draw per equal-probability stratum of its price distribution,
+    in an independent random order.
+    """
+    z = np.array(randomManager.zScores(rows, seeds))
+    draws = len(seeds)
+    if draws == 0 or len(rows) == 0:
+        return z
+
+    rng = np.random.default_rng(seeds[0])
+    for row in np.argsort(-np.asarray(sensitivity))[:strata_courses]:
+        strata = rng.permutation(draws) + rng.random(draws)
+        z[row] = _normals(strata / draws)
+    return z
+
+
+def sample_normals(
+    mode: str, randomManager, rows, seeds, sensitivity=None
+) -> np.ndarray:
+    """(len(rows) x len(seeds)) standard normals drawn with a sampling mode.
+
+    "iid" reads each seed's z-scores from the random manager. The
+    quasi-random modes build one design across all ``seeds`` keyed on the
+    first seed, so a batch of draws is one randomized point set.
+    """
+    seeds = list(seeds)
+    if mode == "iid":
+        return randomManager.zScores(rows, seeds)
+    if mode == "antithetic":
+        return antithetic(randomManager, rows, seeds)
+    if mode == "sobol":
+        return sobol(rows, len(seeds), seeds[0])
+    if mode == "lhs":
+        return latin_hypercube(rows, len(seeds), seeds[0])
+    if mode == "stratified":
+        return stratified(randomManager, rows, seeds, sensitivity)
+    raise ValueError(f"Unknown sampling {mode!r}; expected one of {SAMPLING_MODES}")
+
+
+def benchmark(source_xlsx, candidates, draws=64, replications=30, backend="bnb"):
+    """Variance of course probability estimates per sampling mode.
+
+    Every mode estimates the course probabilities ``replications`` times with
+    ``draws`` draws each, on disjoint Philox seeds. The reduction is the i.i.d.
+    variance divided by the mode's, i.e. how many i.i.d. draws one draw of the
+    mode is worth.
+    """
+    from coursematch_solver import CourseMatchSolver
+
+    report = {}
+    for mode in SAMPLING_MODES:
+        cms = CourseMatchSolver(
+            source_xlsx, candidates, backend=backend, rng="philox", sampling=mode
+        )
+        cms.setup()
+        estimates = np.zeros((replications, len(cms.df)))
+        for r in range(replications):
+            seeds = range(r * draws + 1, (r + 1) * draws + 1)
+            prices = cms.samplePrices(seeds)
+            for j in range(draws):
+                estimates[r, cms.warm.solve(prices[:, j])] += 1 / draws
+        report[mode] = estimates.var(axis=0, ddof=1).sum()
+
+    return {
+        mode: {"variance": variance, "reduction": report["iid"] / variance}
+        for mode, variance in report.items()
+    }
+
+
+if __name__ == "__main__":
+    from coursematch_solver import example_input
+
+    for mode, row in benchmark("data_spring_2025.xlsx", example_input).items():
+        print(
+            f"{mode:>10}  summed variance {row['variance']:.5f}"
+            f"  reduction {row['reduction']:.2f}x"
+        )
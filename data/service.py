@@ -0,0 +1,319 @@
+import json
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Optional
+
+import numpy as np
+
+from backends import get_backend
+from coursematch_solver import get_random_manager
+from jobs import DONE, QueueFull, JobQueue
+from result_cache import ResultCache, SimulationCache
+from terms import TermRegistry
+
+# Fields every forecast or simulation request must carry
+REQUIRED = ("budget", "max_credits", "courses")
+
+
+class BadRequest(ValueError):
+    """A request body the service cannot act on."""
+
+
+class SolveService:
+    """A warm CourseMatch engine shared by every HTTP client.
+
+    Term catalogs stay loaded in the registry and solver backends are
+    resolved at startup. Forecasts run on a bounded pool of solver threads
+    and are answered from a ResultCache when possible; simulations are
+    background jobs on a JobQueue whose progress can be streamed.
+    """
+
+    # Seconds between progress events on a simulation stream
+    EVENT_INTERVAL = 0.25
+    # Most draws a simulation runs to reach a target precision
+    PRECISION_DRAWS = 2000
+
+    def __init__(
+        self,
+        registry: Optional[TermRegistry] = None,
+        backend: str = "highs",
+        solvers: int = 4,
+        simulations: int = 2,
+        simulation_workers: int = 1,
+        max_pending: int = 32,
+        cache_path=None,
+    ):
+        self.registry = registry if registry is not None else TermRegistry()
+        self.backend = backend
+        self.simulation_workers = simulation_workers
+        self.results = ResultCache(path=cache_path)
+        self.jobs = JobQueue(
+            workers=simulations, max_pending=max_pending, cache=SimulationCache()
+        )
+        self._solvers = ThreadPoolExecutor(solvers, thread_name_prefix="solver")
+
+    def warm(self, term_ids=None):
+        """Load catalogs (the latest term by default) and the solver backend."""
+        get_backend(self.backend)
+        for term_id in term_ids or [self.registry.latest]:
+            self.registry.catalog(term_id)
+
+    def close(self):
+        self._solvers.shutdown(cancel_futures=True)
+        self.jobs.shutdown(wait=False)
+
+    def terms(self) -> dict:
+        return {
+            "terms": list(self.registry.terms),
+            "latest": self.registry.latest,
+            "resident": self.registry.resident(),
+        }
+
+    def forecast(self, body: dict) -> list[dict]:
+        """One draw's schedule, shaped like ``example_output``."""
+        term_id, candidates = self._parse(body, "seed")
+        term = self.registry.term(term_id)
+        return self._solvers.submit(
+            self.results.solve,
+            term.catalog_path,
+            candidates,
+            catalog=self.registry.catalog(term_id),
+            backend=self.backend,
+            ztable=term.ztable_path,
+        ).result()
+
+    def simulate(self, body: dict) -> str:
+        """Queue a simulation and return its job id.
+
+        Draws come from the term's z-table, or from the Philox generator
+        when a precision is asked for, since the table's draws are too few
+        for tight intervals; num_simulations is then a cap.
+        """
+        term_id, candidates = self._parse(body)
+        options = {"workers": self.simulation_workers}
+        rng, num_simulations = "table", body.get("num_simulations", 100)
+        if body.get("precision") is not None:
+            options["precision"] = float(body["precision"])
+            rng = "philox"
+            num_simulations = body.get("num_simulations", self.PRECISION_DRAWS)
+        num_simulations = int(num_simulations)
+        if num_simulations < 1:
+            raise BadRequest("num_simulations must be at least 1")
+        # Jobs run after the response, so bad sections are caught up front
+        self._check_sections(term_id, candidates["courses"])
+
+        seed_limit = get_random_manager(
+            rng, self.registry.term(term_id).ztable_path
+        ).seed_limit
+        if seed_limit is not None and num_simulations > seed_limit:
+            raise BadRequest(
+                f"num_simulations is at most {seed_limit} without a precision"
+            )
+        return self.jobs.submit(
+            self.registry.simulator(term_id, backend=self.backend, rng=rng),
+            candidates,
+            num_simulations,
+            **options,
+        )
+
+    def job(self, job_id: str) -> dict:
+        return self.jobs.poll(job_id)
+
+    def events(self, job_id: str):
+        """Yields (event, data) pairs: progress while the job runs, then its end."""
+        job = self.jobs.poll(job_id)
+        draws = None
+        while not job["finished_at"]:
+            if job["draws"] != draws:
+                draws = job["draws"]
+                yield "progress", {
+                    "status": job["status"],
+                    "draws": draws,
+                    "total": job["total"],
+                    "partial": job["partial"],
+                }
+            time.sleep(self.EVENT_INTERVAL)
+            job = self.jobs.poll(job_id)
+        if job["status"] == DONE:
+            yield "result", job["result"]
+        else:
+            yield job["status"], {"error": job["error"]}
+
+    def _parse(self, body, *required) -> tuple[str, dict]:
+        if not isinstance(body, dict):
+            raise BadRequest("Expected a JSON object")
+        missing = [field for field in REQUIRED + required if field not in body]
+        if missing:
+            raise BadRequest(f"Missing fields {missing}")
+        term_id = body.get("term", self.registry.latest)
+        candidates = {
+            field: body[field] for field in REQUIRED + ("seed",) if field in body
+        }
+        return term_id, candidates
+
+    def _check_sections(self, term_id: str, courses):
+        uniqueids = np.asarray([course["uniqueid"] for course in courses], float)
+        catalog = self.registry.catalog(term_id).frame["uniqueid"].to_numpy(float)
+        unknown = np.setdiff1d(uniqueids, catalog)
+        if len(unknown):
+            raise BadRequest(f"Unknown sections: {unknown.tolist()}")
+        if len(np.unique(uniqueids)) < len(uniqueids):
+            raise BadRequest("Sections listed more than once")
+
+
+def _default(value):
+    # numpy scalars and arrays that ride along in simulation results
+    if isinstance(value, (np.generic, np.ndarray)):
+        return value.tolist()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(value) -> bytes:
+    return json.dumps(value, default=_default).encode()
+
+
+class ServiceHandler(BaseHTTPRequestHandler):
+    """Routes HTTP requests to a SolveService.
+
+    - ``GET /terms``: available, latest and loaded terms
+    - ``POST /forecast``: ``example_input`` (plus an optional ``term``) in,
+      ``example_output`` out
+    - ``POST /simulate``: the same input plus optional ``num_simulations``
+      and ``precision`` (see SolveService.simulate); 202 with the queued
+      job, or with ``Accept: text/event-stream`` the job's events straight
+      away
+    - ``GET /simulations/<id>``: the job's status, progress and result
+    - ``GET /simulations/<id>/events``: the job's events as server-sent events
+    """
+
+    service: Optional[SolveService] = None
+    protocol_version = "HTTP/1.1"
+
+    JOB = re.compile(r"/simulations/([0-9a-f]+)(/events)?")
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        match = self.JOB.fullmatch(path)
+        if path == "/terms":
+            self._send(200, self.service.terms())
+            return
+        if match is None:
+            self._send(404, {"error": f"No such endpoint {path}"})
+            return
+        try:
+            job = self.service.job(match[1])
+        except KeyError:
+            self._send(404, {"error": f"No such simulation {match[1]}"})
+            return
+        if match[2]:
+            self._stream(match[1])
+        else:
+            self._send(200, job)
+
+    def do_POST(self):
+        path = self.path.split("?", 1)[0]
+        # Read the body whatever the route, so the next request on a
+        # kept-alive connection starts where this one ends
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Where the body ends is unknown, so the connection cannot be reused
+            self.close_connection = True
+            self._send(400, {"error": "Bad Content-Length"})
+            return
+        data = self.rfile.read(length)
+        if path not in ("/forecast", "/simulate"):
+            self._send(404, {"error": f"No such endpoint {path}"})
+            return
+        try:
+            body = json.loads(data or b"null")
+            if path == "/forecast":
+                self._send(200, self.service.forecast(body))
+                return
+            job_id = self.service.simulate(body)
+        except QueueFull as error:
+            self._send(503, {"error": str(error)})
+            return
+        except (ValueError, TypeError, KeyError) as error:
+            # Malformed JSON, bad fields, unknown terms or sections
+            self._send(400, {"error": f"{type(error).__name__}: {error}"})
+            return
+
+        if "text/event-stream" in self.headers.get("Accept", ""):
+            self._stream(job_id)
+        else:
+            self._send(202, self.service.job(job_id))
+
+    def _send(self, status: int, value):
+        payload = dumps(value)
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        if self.close_connection:
+            self.send_header("Connection", "close")
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def _stream(self, job_id: str):
+        # No length up front, so the connection closes after the last event
+        self.send_response(200)
+        self.send_header("Content-Type", "text/event-stream")
+        self.send_header("Cache-Control", "no-cache")
+        self.send_header("X-Job-Id", job_id)
+        self.send_header("Connection", "close")
+        self.end_headers()
+        self.close_connection = True
+        try:
+            for event, data in self.service.events(job_id):
+                self.wfile.write(b"event: " + event.encode() + b"\ndata: ")
+                self.wfile.write(dumps(data) + b"\n\n")
+                self.wfile.flush()
+        except (BrokenPipeError, ConnectionResetError):
+            # The client went away; the job carries on and stays pollable
+            pass
+
+
+def serve(service: SolveService, host: str = "127.0.0.1", port: int = 8000):
+    """Serve ``service`` over HTTP until interrupted."""
+    handler = type("Handler", (ServiceHandler,), {"service": service})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    print(f"Serving on http://{host}:{port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="CourseMatch solve service")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--backend", default="highs")
+    parser.add_argument("--solvers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--simulations", type=int, default=2)
+    parser.add_argument("--cache", help="SQLite file for forecast results")
+    parser.add_argument(
+        "--terms", nargs="*", help="Terms to load at startup (default: the latest)"
+    )
+    args = parser.parse_args()
+
+    service = SolveService(
+        backend=args.backend,
+        solvers=args.solvers,
+        simulations=args.simulations,
+        simulation_workers=max(1, (os.cpu_count() or 1) // args.simulations),
+        cache_path=args.cache,
+    )
+    service.warm(args.terms)
+    serve(service, args.host, args.port)
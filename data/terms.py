@@ -0,0 +1,122 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+from catalog_tables import load_tables
+from coursematch_solver import CatalogStore, CompiledCatalog, CourseMatchSolver
+from montecarlo import MonteCarloSimulator
+
+DATA_DIR = os.path.dirname(os.path.abspath(__file__))
+WEB_DIR = os.path.join(DATA_DIR, os.pardir, "web", "src", "data", "regular-courses")
+
+# Term ids follow the web app: year plus A (spring), B (summer) or C (fall)
+SEASONS = {"spring": "A", "summer": "B", "fall": "C"}
+WORKBOOK = re.compile(r"data_(spring|summer|fall)_(\d{4})\.xlsx")
+EXPORT = re.compile(r"(\d{4}[ABC])-courses\.csv")
+
+
+class Term:
+    """Where one term's catalog and z-table live on disk."""
+
+    def __init__(self, term_id: str, catalog_path: str, ztable_path: str):
+        self.term_id = term_id
+        self.catalog_path = catalog_path
+        self.ztable_path = ztable_path
+
+    def __repr__(self):
+        return f"Term({self.term_id!r}, {os.path.basename(self.catalog_path)!r})"
+
+
+def discover(data_dir=DATA_DIR, web_dir=WEB_DIR) -> dict[str, Term]:
+    """Find every term with a catalog, oldest first.
+
+    Workbooks ``data_<season>_<year>.xlsx`` use ``z_score_table_<season>_<year>.xlsx``
+    when present and the shared ``z_score_table.xlsx`` otherwise. Web exports
+    ``<term>-courses.csv`` carry their own sampled prices, so each is its own
+    z-table. A workbook wins over an export of the same term.
+    """
+    terms = {}
+    if os.path.isdir(web_dir):
+        for name in os.listdir(web_dir):
+            match = EXPORT.fullmatch(name)
+            if match:
+                path = os.path.abspath(os.path.join(web_dir, name))
+                terms[match[1]] = Term(match[1], path, path)
+
+    for name in os.listdir(data_dir):
+        match = WORKBOOK.fullmatch(name)
+        if match:
+            season, year = match.groups()
+            ztable = os.path.join(data_dir, f"z_score_table_{season}_{year}.xlsx")
+            if not os.path.exists(ztable):
+                ztable = os.path.join(data_dir, "z_score_table.xlsx")
+            term_id = year + SEASONS[season]
+            terms[term_id] = Term(term_id, os.path.join(data_dir, name), ztable)
+
+    return dict(sorted(terms.items()))
+
+
+class TermRegistry:
+    """Serves each discovered term's compiled catalog, loading it on first use.
+
+    At most ``capacity`` catalogs stay resident; asking for another evicts
+    the least recently used one, which is simply reloaded (from its compiled
+    artifact when fresh) if it is asked for again.
+    """
+
+    def __init__(self, capacity: int = 2, data_dir=DATA_DIR, web_dir=WEB_DIR):
+        self.capacity = capacity
+        self.terms = discover(data_dir, web_dir)
+        self._catalogs: OrderedDict[str, CompiledCatalog] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def latest(self) -> str:
+        return next(reversed(self.terms))
+
+    def term(self, term_id: str) -> Term:
+        try:
+            return self.terms[term_id]
+        except KeyError:
+            raise ValueError(
+                f"Unknown term {term_id!r}; expected one of {list(self.terms)}"
+            ) from None
+
+    def catalog(self, term_id: str) -> CompiledCatalog:
+        term = self.term(term_id)
+        with self._lock:
+            if term_id in self._catalogs:
+                self._catalogs.move_to_end(term_id)
+                return self._catalogs[term_id]
+            catalog = CatalogStore.compile(term.catalog_path, load_tables(term_id))
+            self._catalogs[term_id] = catalog
+            while len(self._catalogs) > self.capacity:
+                self._catalogs.popitem(last=False)
+            return catalog
+
+    def resident(self) -> list[str]:
+        """Loaded terms, least recently used first."""
+        with self._lock:
+            return list(self._catalogs)
+
+    def solve_many(self, term_id: str, candidates, **kwargs) -> list[list[dict]]:
+        """``CourseMatchSolver.solve_many`` against a term's catalog."""
+        term = self.term(term_id)
+        return CourseMatchSolver.solve_many(
+            term.catalog_path,
+            candidates,
+            catalog=self.catalog(term_id),
+            ztable=term.ztable_path,
+            **kwargs,
+        )
+
+    def simulator(self, term_id: str, **kwargs) -> MonteCarloSimulator:
+        """A Monte Carlo simulator over a term's catalog."""
+        term = self.term(term_id)
+        return MonteCarloSimulator(
+            term.catalog_path,
+            catalog=self.catalog(term_id),
+            ztable=term.ztable_path,
+            **kwargs,
+        )
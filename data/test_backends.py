@@ -0,0 +1,164 @@
+import io
+import itertools
+import random
+from contextlib import redirect_stdout
+
+import numpy as np
+import pytest
+
+from backends import (
+    COST_TOLERANCE,
+    FEASIBILITY_TOLERANCE,
+    VALUE_TOLERANCE,
+    BranchAndBoundBackend,
+    CourseMatchModel,
+    EnumerationBackend,
+    ScheduleCache,
+    WarmStartSolver,
+    get_backend,
+)
+
+BACKENDS = ["highs", "scipy", "bnb"]
+
+
+def random_model(rng: random.Random, size: int) -> CourseMatchModel:
+    """A model with plenty of ties: few distinct utilities and credits."""
+    names = rng.sample(range(1, 10 * size), size)
+    utilities = np.array([rng.choice([0, 40, 60, 60, 80]) for _ in range(size)])
+    credits = np.array([rng.choice([0.5, 1.0, 1.0]) for _ in range(size)])
+    packing = {}
+    for group in range(size // 3):
+        packing[f"Max_One_{group}"] = sorted(rng.sample(range(size), 2))
+    for slot in range(size // 4):
+        packing[f"No_Overlap_{slot}"] = sorted(rng.sample(range(size), 3))
+    return CourseMatchModel(
+        names=names,
+        objective=utilities * credits,
+        credits=credits,
+        budget=rng.choice([3000, 4500, 5000]),
+        max_credits=rng.choice([3.0, 4.0, 5.0]),
+        packing=packing,
+    )
+
+
+def random_prices(rng: random.Random, size: int) -> np.ndarray:
+    # Zero and round prices make equally cheap schedules common
+    return np.array(
+        [rng.choice([0.0, 500.0, 1000.0, rng.uniform(0, 2500)]) for _ in range(size)]
+    )
+
+
+def canonical(model: CourseMatchModel, prices) -> list[int]:
+    """The canonical optimum by brute force over every schedule."""
+    useful = [i for i in range(model.size) if model.objective[i] > 0]
+    best, best_value, best_cost = [], 0.0, 0.0
+    for count in range(1, len(useful) + 1):
+        for schedule in itertools.combinations(useful, count):
+            schedule = list(schedule)
+            cost = prices[schedule].sum()
+            if (
+                cost > model.budget + FEASIBILITY_TOLERANCE
+                or model.credits[schedule].sum()
+                > model.max_credits + FEASIBILITY_TOLERANCE
+                or any(
+                    len(set(members) & set(schedule)) > 1
+                    for members in model.packing.values()
+                )
+            ):
+                continue
+            value = model.objective[schedule].sum()
+            if value > best_value + VALUE_TOLERANCE:
+                better = True
+            elif value < best_value - VALUE_TOLERANCE:
+                better = False
+            elif abs(cost - best_cost) > COST_TOLERANCE:
+                better = cost < best_cost
+            else:
+                differ = set(schedule) ^ set(best)
+                better = min(differ, key=lambda i: model.names[i]) in schedule
+            if better:
+                best, best_value, best_cost = schedule, value, cost
+    return best
+
+
+def solve(backend, model, prices) -> list[int]:
+    solver = get_backend(backend)
+    solver.load(model)
+    # PuLP's CBC writes its log to stdout
+    with redirect_stdout(io.StringIO()):
+        return solver.solve(prices)
+
+
+@pytest.mark.parametrize("backend", BACKENDS + ["enum", "pulp"])
+def test_small_models_match_brute_force(backend):
+    rng = random.Random(7)
+    for _ in range(25):
+        model = random_model(rng, rng.randint(4, 11))
+        prices = random_prices(rng, model.size)
+        assert solve(backend, model, prices) == canonical(model, prices)
+
+
+@pytest.mark.parametrize("backend", BACKENDS + ["enum"])
+def test_backends_match_pulp(backend):
+    rng = random.Random(11)
+    for _ in range(15):
+        model = random_model(rng, rng.randint(20, 40))
+        expected = get_backend("pulp")
+        expected.load(model)
+        solver = get_backend(backend)
+        solver.load(model)
+        for _ in range(4):
+            prices = random_prices(rng, model.size)
+            with redirect_stdout(io.StringIO()):
+                wanted = expected.solve(prices)
+            selected = solver.solve(prices)
+            assert model.objective[selected].sum() == pytest.approx(
+                model.objective[wanted].sum()
+            )
+            assert selected == wanted
+
+
+@pytest.mark.parametrize("ties", [0, BranchAndBoundBackend.TIES])
+def test_tie_break_matches_enumeration(ties):
+    # Equal utilities tie almost every schedule; with no ties kept, the
+    # search in name order has to settle them
+    rng = random.Random(13)
+    for _ in range(10):
+        model = random_model(rng, rng.randint(15, 30))
+        model.objective = np.where(model.objective > 0, 60.0, 0.0) * model.credits
+        enumerated = EnumerationBackend()
+        enumerated.load(model)
+        exact = BranchAndBoundBackend()
+        exact.load(model)
+        exact.TIES = ties
+        for _ in range(4):
+            prices = random_prices(rng, model.size)
+            assert exact.solve(prices) == enumerated.solve(prices)
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_schedule_cache_matches_backend(backend):
+    rng = random.Random(17)
+    for _ in range(10):
+        model = random_model(rng, rng.randint(15, 30))
+        solver = get_backend(backend)
+        solver.load(model)
+        cache = ScheduleCache(WarmStartSolver(solver, model.budget), model)
+        for _ in range(8):
+            prices = random_prices(rng, model.size)
+            assert cache.solve(prices) == solver.solve(prices)
+
+
+def test_enumeration_matches_its_fallback():
+    rng = random.Random(19)
+    for _ in range(10):
+        model = random_model(rng, rng.randint(15, 30))
+        enumerated = EnumerationBackend()
+        enumerated.load(model)
+        fallback = EnumerationBackend(limit=0)
+        fallback.load(model)
+        assert enumerated.vectorized and not fallback.vectorized
+        price_matrix = np.column_stack(
+            [random_prices(rng, model.size) for _ in range(8)]
+        )
+        assert enumerated.solve_all(price_matrix) == fallback.solve_all(price_matrix)
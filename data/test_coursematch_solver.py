@@ -0,0 +1,58 @@
+import os
+import random
+
+import pytest
+
+from coursematch_solver import CourseMatchSolver, example_input
+
+SOURCE = os.path.join(
+    os.path.dirname(os.path.abspath(__file__)), "data_spring_2025.xlsx"
+)
+
+
+def merged(courses) -> CourseMatchSolver:
+    cms = CourseMatchSolver(SOURCE, {**example_input, "courses": courses})
+    cms.unpack(cms.candidates)
+    cms.mergeData()
+    return cms
+
+
+def distinct_utilities() -> list[dict]:
+    # A utility per section, so a mismatched row shows up
+    return [
+        {"uniqueid": course["uniqueid"], "utility": 10 + i}
+        for i, course in enumerate(example_input["courses"])
+    ]
+
+
+def test_utilities_follow_their_sections():
+    courses = distinct_utilities()
+    df = merged(courses).df
+    wanted = {course["uniqueid"]: course["utility"] for course in courses}
+    assert len(df) == len(courses)
+    assert [wanted[uniqueid] for uniqueid in df["uniqueid"]] == df["utilities"].tolist()
+
+
+def test_order_of_courses_does_not_matter():
+    courses = distinct_utilities()
+    shuffled = courses[:]
+    random.Random(5).shuffle(shuffled)
+    # Integer and float ids name the same section
+    shuffled = [
+        {**course, "uniqueid": float(course["uniqueid"])} for course in shuffled
+    ]
+    expected = merged(courses).df[["uniqueid", "utilities"]]
+    actual = merged(shuffled).df[["uniqueid", "utilities"]]
+    assert actual.equals(expected)
+
+
+def test_duplicate_sections_are_rejected():
+    courses = distinct_utilities()
+    with pytest.raises(ValueError, match="more than once"):
+        merged(courses + courses[:1])
+
+
+def test_unknown_sections_are_rejected():
+    courses = distinct_utilities() + [{"uniqueid": 999999, "utility": 50}]
+    with pytest.raises(ValueError, match="Unknown sections"):
+        merged(courses)
@@ -0,0 +1,113 @@
+import datetime
+
+import numpy as np
+import pandas as pd
+
+# Columns of the catalog workbooks, in order; web exports are mapped onto these
+WORKBOOK_COLUMNS = [
+    "uniqueid",
+    "term",
+    "primary_section_id",
+    "title",
+    "instructor",
+    "part_of_term",
+    "start_date",
+    "end_date",
+    "days_code",
+    "start_time_24hr",
+    "stop_time_24hr",
+    "credit_unit",
+    "capacity",
+    "price_predicted",
+    "resid_mean",
+    "resid_stdev",
+    "overall_course_quality",
+    "overall_instructor_quality",
+    "overall_difficulty",
+    "overall_work_required",
+    *(
+        f"instructor_{i}{field}"
+        for i in (1, 2, 3)
+        for field in (
+            "",
+            "_course_quality",
+            "_quality",
+            "_difficulty",
+            "_work_required",
+        )
+    ),
+]
+
+RENAMES = {
+    "forecast_id": "primary_section_id",
+    "instructors": "instructor",
+    "credits": "credit_unit",
+    "truncated_price_prediction": "price_predicted",
+    "price_prediction_residual_mean": "resid_mean",
+    "price_prediction_residual_std_dev": "resid_stdev",
+}
+
+# Web exports number quarters within the semester; workbooks number them
+# within the academic year
+PARTS_OF_TERM = {
+    "Fall": {"Q1": "1", "Q2": "2", "Full": "F", "Modular": "Modular"},
+    "Spring": {"Q1": "3", "Q2": "4", "Full": "S", "Modular": "Modular"},
+}
+
+
+def is_export(path) -> bool:
+    """Whether ``path`` is a course CSV exported for the web app."""
+    if not str(path).endswith(".csv"):
+        return False
+    with open(path) as file:
+        return "forecast_id" in file.readline().split(",")
+
+
+def _time(text: str) -> datetime.time:
+    return datetime.datetime.strptime(text, "%I:%M %p").time()
+
+
+def read_catalog(path) -> pd.DataFrame:
+    """Read a web export into the workbook's columns.
+
+    Sections are numbered from 1 in file order, matching the rows of
+    :func:`read_ztable`, and ``resid_mean`` is set so that the mean price is
+    the export's ``bias_corrected``. Evaluation columns the export lacks are
+    left empty.
+    """
+    # The per-seed price columns belong to read_ztable
+    export = pd.read_csv(path, usecols=lambda column: not column.isdigit())
+    dates = {
+        column: pd.to_datetime(export[column], format="%m %d %Y")
+        for column in ("start_date", "end_date")
+    }
+    frame = export.rename(columns=RENAMES).assign(
+        uniqueid=np.arange(1, len(export) + 1, dtype=np.float64),
+        part_of_term=[
+            PARTS_OF_TERM[semester][part]
+            for semester, part in zip(export["semester"], export["part_of_term"])
+        ],
+        start_time_24hr=export["start_time"].map(_time),
+        stop_time_24hr=export["stop_time"].map(_time),
+        # Exports draw around the mean floored at zero, not the raw residual mean
+        resid_mean=export["bias_corrected"] - export["truncated_price_prediction"],
+        **dates,
+    )
+    return frame.reindex(columns=WORKBOOK_COLUMNS)
+
+
+def read_ztable(path) -> pd.DataFrame:
+    """Recover the z-table behind a web export's sampled prices.
+
+    Each export carries one price column per seed, drawn as
+    ``bias_corrected + z * std_dev``; sections without spread get z = 0.
+    """
+    export = pd.read_csv(path)
+    seeds = [column for column in export.columns if column.isdigit()]
+    stdev = export["price_prediction_residual_std_dev"].to_numpy(dtype=np.float64)
+    prices = export[seeds].to_numpy(dtype=np.float64)
+    mean = export["bias_corrected"].to_numpy(dtype=np.float64)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (prices - mean[:, np.newaxis]) / stdev[:, np.newaxis]
+    z[stdev == 0] = 0
+    return pd.DataFrame(z, columns=[int(seed) for seed in seeds])